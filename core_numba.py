@@ -0,0 +1,448 @@
+"""
+Compiled Scoring Core for the Risk Capacity Estimator
+
+This module contains the risk capacity mapping functions (each input -> 0-100
+subscore), compiled with Numba, plus entry points that run the whole scoring pipeline:
+
+- map_all(...) + capacity_tenths(...): subscores and score for one person
+  (used by the Streamlit app whenever the capacity inputs change)
+- score_one(...): scores a single person straight from the raw inputs
+- score_batch(...): scores many people at once (used by the batch CSV upload)
+
+Why a separate module?
+Numba compiles these functions to machine code the first time they are needed and
+stores the result on disk (cache=True), so later Streamlit reruns and restarts reuse
+the compiled code instead of running the Python if-ladders in the interpreter.
+
+This is the only implementation of the capacity mappings: the app, the sensitivity
+scenarios (risk_core.sensitivity_scores) and the batch upload all call these functions.
+
+Author: istaawoo
+License: See LICENSE file
+"""
+
+import numpy as np
+from numba import njit
+
+# -----------------------
+# Industry Encoding
+# -----------------------
+# Numba's fast (nopython) mode cannot work with strings efficiently, so the industry
+# category is passed in as a small integer code instead.
+# Any code not listed here is treated like an unrecognized category (score 60).
+
+INDUSTRY_CODES = {"Stable": 0, "Moderate": 1, "Unstable": 2}
+
+# -----------------------
+# Risk Capacity Weights
+# -----------------------
+# Same weights as WEIGHTS in risk_core.py (which checks that the two agree), stored
+# as whole numbers in the fixed order SLI, Income, Expenses, Industry, Age, Growth, Dependents.
+# Numba treats these module-level numbers as compile-time constants.
+
+W_SLI = 25
+W_INCOME = 20
+W_EXPENSES = 15
+W_INDUSTRY = 12
+W_AGE = 12
+W_GROWTH = 8
+W_DEPENDENTS = 8
+
+# All seven weights as an array, for functions that receive the subscores as an array
+WEIGHTS_ARR = np.array(
+    [W_SLI, W_INCOME, W_EXPENSES, W_INDUSTRY, W_AGE, W_GROWTH, W_DEPENDENTS], dtype=np.int64
+)
+
+# -----------------------
+# Score Lookup Tables
+# -----------------------
+# Age and dependents are whole numbers, so their scores are stored for every value
+# (see map_age and map_dependents for the bands). Numba compiles these module-level
+# arrays in as constants, so a lookup is a single memory read.
+
+# AGE_SCORE_TABLE[age] for ages 0-66: 0-30 -> 90, 31-40 -> 75, 41-55 -> 50,
+# 56-65 -> 30, 66 (and anything older) -> 10
+AGE_SCORE_TABLE = np.repeat(
+    np.array([90.0, 75.0, 50.0, 30.0, 10.0]), np.array([31, 10, 15, 10, 1])
+)
+
+# DEPENDENTS_SCORE_TABLE[d] for 0-4 dependents (4 or more, or a negative count -> 15)
+DEPENDENTS_SCORE_TABLE = np.array([90.0, 70.0, 50.0, 30.0, 15.0])
+
+# -----------------------
+# Compiled Mapping Functions
+# -----------------------
+
+@njit("float64(float64)", cache=True)
+def map_sli(sli):
+    """
+    Calculates a risk score (0-100) based on the Savings Longevity Index (SLI).
+
+    SLI measures how many years your savings could last if you had to live off them:
+    SLI = Total Investable Assets / Annual Withdrawals
+
+    Parameters:
+    sli (float): Number of years savings would last at current withdrawal rate
+
+    Returns:
+    float: Risk capacity score (0-100) where:
+    - 0 means very low capacity (savings last less than 1 year)
+    - 40 means moderate capacity (savings last 5 years)
+    - 80 means high capacity (savings last 20 years)
+    - 100 means maximum capacity (savings last 50+ years)
+
+    Example:
+    If someone has $100,000 in savings and withdraws $20,000/year:
+    SLI = 100,000 / 20,000 = 5 years
+    This would return a moderate risk capacity score around 40
+    """
+    # The bands are tested starting with the most common one (5-20 years), with the
+    # rare ends (1 year or less, over 50 years) last, so typical inputs take the
+    # fewest comparisons. The result is the same as testing the bands in order.
+    if sli > 5.0:
+        if sli <= 20.0:
+            return 40.0 + (sli - 5.0) / (20.0 - 5.0) * (80.0 - 40.0)
+        if sli <= 50.0:
+            return 80.0 + (sli - 20.0) / (50.0 - 20.0) * (95.0 - 80.0)
+        # Anything from 200 years up scores 100; capping the input at 200 already
+        # caps the score at 100, so the result needs no second clamp
+        capped = sli if sli < 200.0 else 200.0
+        return 95.0 + (capped - 50.0) / (200.0 - 50.0) * (100.0 - 95.0)
+    if sli > 1.0:
+        return 1.0 + (sli - 1.0) / (5.0 - 1.0) * (40.0 - 1.0)
+    return 0.0
+
+@njit("float64(float64)", cache=True)
+def map_income_ratio(r):
+    """
+    Calculates a risk score (0-100) based on the Income-to-Expenses Ratio.
+
+    This ratio shows how well your income covers your expenses:
+    Ratio = Annual Income / (Annual Fixed Expenses + Annual Variable Expenses)
+
+    Parameters:
+    r (float): Income-to-Expenses ratio
+
+    Returns:
+    float: Risk capacity score (0-100) where:
+    - 10 means very low capacity (income barely covers or doesn't cover expenses)
+    - 40 means moderate capacity (income is 1.5x expenses)
+    - 75 means high capacity (income is 2.5x expenses)
+    - 100 means maximum capacity (income is 10x or more than expenses)
+
+    Example:
+    If someone earns $60,000/year and has $30,000 in total expenses:
+    Ratio = 60,000 / 30,000 = 2.0
+    This would return a moderate-to-high risk capacity score around 60
+    """
+    # Most common band (1.5-2.5) first, as in map_sli
+    if r > 1.5:
+        if r <= 2.5:
+            return 40.0 + (r - 1.5) / (2.5 - 1.5) * (75.0 - 40.0)
+        # Capped at 10 (score 100), as in map_sli
+        capped = r if r < 10.0 else 10.0
+        return 75.0 + (capped - 2.5) / (10.0 - 2.5) * (100.0 - 75.0)
+    if r > 1.0:
+        return 10.0 + (r - 1.0) / (1.5 - 1.0) * (40.0 - 10.0)
+    return 10.0
+
+@njit("float64(float64)", cache=True)
+def map_emergency_months(months):
+    """
+    Calculates a risk score (0-100) based on Emergency Fund coverage.
+
+    Emergency Fund coverage shows how many months you could cover expenses with savings:
+    Months = Total Investable Assets / Monthly Expenses
+
+    Parameters:
+    months (float): Number of months expenses could be covered by savings
+
+    Returns:
+    float: Risk capacity score (0-100) where:
+    - 5 means very low capacity (less than 1 month of expenses covered)
+    - 40 means moderate capacity (3 months of expenses covered)
+    - 70 means high capacity (6 months of expenses covered)
+    - 100 means maximum capacity (24+ months of expenses covered)
+
+    Example:
+    If someone has $30,000 in savings and $5,000 in monthly expenses:
+    Months = 30,000 / 5,000 = 6 months
+    This would return a high risk capacity score of 70
+    """
+    # Most common band (3-6 months) first, as in map_sli
+    if months > 3.0:
+        if months <= 6.0:
+            return 40.0 + (months - 3.0) / (6.0 - 3.0) * (70.0 - 40.0)
+        # Capped at 24 months (score 100), as in map_sli
+        capped = months if months < 24.0 else 24.0
+        return 70.0 + (capped - 6.0) / (24.0 - 6.0) * (100.0 - 70.0)
+    if months > 1.0:
+        return 20.0 + (months - 1.0) / (3.0 - 1.0) * (40.0 - 20.0)
+    return 5.0
+
+@njit("float64(int64)", cache=True)
+def map_industry(code):
+    """
+    Calculates a risk score (0-100) based on industry stability.
+
+    Different industries have different levels of job security and income stability.
+    For example:
+    - Stable: Government, Healthcare, Utilities
+    - Moderate: Technology, Manufacturing, Education
+    - Unstable: Startups, Real Estate, Entertainment
+
+    Parameters:
+    code (int): Industry stability category as a code from INDUSTRY_CODES
+        (0 = Stable, 1 = Moderate, 2 = Unstable)
+
+    Returns:
+    float: Risk capacity score where:
+    - 90 for Stable industries (high job security)
+    - 60 for Moderate industries (average job security)
+    - 25 for Unstable industries (low job security)
+    Default is 60 if category is not recognized
+    """
+    if code == 0:  # Stable
+        return 90.0
+    if code == 2:  # Unstable
+        return 25.0
+    return 60.0  # Moderate, or unrecognized category
+
+@njit("float64(int64)", cache=True)
+def map_age(age):
+    """
+    Calculates a risk score (0-100) based on age.
+
+    Younger people generally can take more investment risk because they:
+    1. Have more time to recover from market downturns
+    2. Usually have more earning years ahead
+    3. Can adjust their financial strategy over time
+
+    Parameters:
+    age (int): Person's age in years
+
+    Returns:
+    float: Risk capacity score where:
+    - 90 for age <= 30 (highest risk capacity)
+    - 75 for ages 31-40
+    - 50 for ages 41-55
+    - 30 for ages 56-65
+    - 10 for ages > 65 (lowest risk capacity)
+    """
+    # Ages below 0 or above the table use its first/last entry
+    return AGE_SCORE_TABLE[min(max(age, 0), AGE_SCORE_TABLE.shape[0] - 1)]
+
+@njit("float64(float64)", cache=True)
+def map_growth(g):
+    """
+    Calculates a risk score (0-100) based on expected salary growth.
+
+    Higher expected salary growth allows for more risk-taking because:
+    1. Future higher income can offset investment losses
+    2. Increases future saving capacity
+    3. Provides more financial flexibility
+
+    Parameters:
+    g (float): Expected annual salary growth percentage
+
+    Returns:
+    float: Risk capacity score where:
+    - 10 for negative growth (declining income)
+    - 30 for 0-2% growth (below inflation)
+    - 60 for 2-5% growth (moderate growth)
+    - 85 for > 5% growth (high growth)
+    """
+    if g < 0.0:
+        return 10.0
+    if g < 2.0:
+        return 30.0
+    if g < 5.0:
+        return 60.0
+    return 85.0
+
+@njit("float64(int64)", cache=True)
+def map_dependents(d):
+    """
+    Calculates a risk score (0-100) based on number of dependents.
+
+    More dependents typically mean:
+    1. Higher fixed expenses (food, healthcare, education)
+    2. Less financial flexibility
+    3. Greater need for stable income
+
+    Parameters:
+    d (int): Number of financial dependents
+
+    Returns:
+    float: Risk capacity score where:
+    - 90 for 0 dependents (maximum flexibility)
+    - 70 for 1 dependent
+    - 50 for 2 dependents
+    - 30 for 3 dependents
+    - 15 for 4+ dependents (minimum flexibility)
+    """
+    if 0 <= d < DEPENDENTS_SCORE_TABLE.shape[0]:
+        return DEPENDENTS_SCORE_TABLE[d]
+    return 15.0
+
+# -----------------------
+# Whole-Pipeline Scoring
+# -----------------------
+
+@njit("int64(float64)", cache=True)
+def round_to_tenths(score):
+    """
+    Rounds a 0-100 score to whole tenths of a point, giving exactly the same result
+    as Python's round(score, 1) (e.g. 59.552 -> 596, 82.55 -> 825).
+
+    Why not simply int(score * 10 + 0.5)?
+    round() looks at the exact value stored in the float. 82.55, for example, is
+    stored as 82.54999999999999..., so round() gives 82.5, while score * 10 + 0.5
+    comes out as 826.0 and would give 82.6. This function makes the same decision
+    as round():
+    1. Takes the tenth just below the score (k) and the halfway point above it
+    2. If the score is clearly below or above the halfway point, the answer is k or k + 1
+    3. Only if the score is the float closest to the halfway point does it check,
+       with exact arithmetic, whether that float lies just below, just above or
+       exactly on it (an exact tie, e.g. 20.75, goes to the even tenth as in round())
+
+    Parameters:
+    score (float): A score between 0 and 100
+
+    Returns:
+    int: The score in whole tenths of a point (0-1000, e.g. 826 = 82.6)
+    """
+    k = np.int64(np.floor(score * 10.0))
+    halfway = (2 * k + 1) / 20.0
+    if score < halfway:
+        return k
+    if score > halfway:
+        return k + 1
+    # score is the float closest to the halfway point (2k + 1) / 20, which a float
+    # can only sometimes hold exactly (e.g. 20.75). Work out halfway * 20 as an exact
+    # sum of two floats (times 16 and times 4 are exact, and the error of the addition
+    # is recovered exactly) to see on which side of 2k + 1 it lies.
+    a = halfway * 16.0
+    b = halfway * 4.0
+    total = a + b
+    b_used = total - a
+    error = (a - (total - b_used)) + (b - b_used)
+    target = float(2 * k + 1)
+    if total > target or (total == target and error > 0.0):
+        return k + 1
+    if total < target or error < 0.0:
+        return k
+    # An exact tie: round to the even tenth, as round() does
+    return k + (k % 2)
+
+@njit("int64(float64[:])", cache=True)
+def capacity_tenths(subscores):
+    """
+    Combines the seven subscores into the final risk capacity score, kept as a whole
+    number of tenths of a point so scores can be compared and subtracted exactly.
+
+    Each subscore is multiplied by its whole-percent weight and the products are added
+    up in WEIGHTS_ARR order; the total divided by 100 is the weighted average, which is
+    rounded once, to tenths, with round_to_tenths (the same result as round(score, 1)).
+
+    No clamping to 0-100 is needed: every map_* function returns a subscore
+    between 0 and 100 and the weights add up to exactly 100, so the weighted
+    average is always between 0 and 100 (0-1000 tenths).
+
+    Parameters:
+    subscores (numpy.ndarray): The seven subscores as float64, in WEIGHTS_ARR order
+        (SLI, Income, Expenses, Industry, Age, Growth, Dependents)
+
+    Returns:
+    int: Final risk capacity score in whole tenths of a point (0-1000, e.g. 826 = 82.6)
+    """
+    total = 0.0
+    for i in range(subscores.shape[0]):
+        total += WEIGHTS_ARR[i] * subscores[i]
+    # Round once, on the weighted average; no clamp needed (see above)
+    return round_to_tenths(total / 100.0)
+
+@njit("float64[:](float64, float64, float64, int64, int64, float64, int64)", cache=True)
+def map_all(sli_value, income_ratio, months, industry_code, age, expected_growth, dependents):
+    """
+    Maps all seven factors to their 0-100 subscores in one compiled call.
+
+    Parameters:
+    The SLI, income ratio and emergency months already worked out from the inputs,
+    plus the industry code (from INDUSTRY_CODES), age, salary growth and dependents.
+
+    Returns:
+    numpy.ndarray: The seven subscores in WEIGHTS_ARR order, ready for capacity_tenths
+    """
+    subscores = np.empty(7, dtype=np.float64)
+    subscores[0] = map_sli(sli_value)
+    subscores[1] = map_income_ratio(income_ratio)
+    subscores[2] = map_emergency_months(months)
+    subscores[3] = map_industry(industry_code)
+    subscores[4] = map_age(age)
+    subscores[5] = map_growth(expected_growth)
+    subscores[6] = map_dependents(dependents)
+    return subscores
+
+@njit(
+    "float64(int64, int64, float64, float64, float64, int64, float64, float64, float64)",
+    cache=True,
+)
+def score_one(age, dependents, annual_income, annual_fixed, annual_variable,
+              industry_code, expected_growth, investable_assets, annual_withdrawals):
+    """
+    Calculates the final risk capacity score (0-100) for one person.
+
+    This does in one compiled call what the app otherwise does in several steps:
+    1. Works out the SLI, income ratio and emergency months from the raw inputs
+    2. Maps every factor to its 0-100 subscore
+    3. Combines the subscores with the capacity weights and rounds once, as capacity_tenths does
+
+    Parameters:
+    The raw form inputs, with industry passed as a code from INDUSTRY_CODES.
+
+    Returns:
+    float: Final risk capacity score (0-100, 1 decimal place): capacity_tenths of
+        the subscores, divided by 10
+    """
+    expenses = annual_fixed + annual_variable
+    sli_value = investable_assets / max(1.0, annual_withdrawals)
+    income_ratio = annual_income / max(1.0, expenses)
+    months = investable_assets / max(1.0, expenses / 12.0)
+
+    # Weighted total in WEIGHTS_ARR order (as in capacity_tenths)
+    total = (
+        W_SLI * map_sli(sli_value)
+        + W_INCOME * map_income_ratio(income_ratio)
+        + W_EXPENSES * map_emergency_months(months)
+        + W_INDUSTRY * map_industry(industry_code)
+        + W_AGE * map_age(age)
+        + W_GROWTH * map_growth(expected_growth)
+        + W_DEPENDENTS * map_dependents(dependents)
+    )
+    # Round once, to tenths; no clamp needed, see capacity_tenths
+    return round_to_tenths(total / 100.0) / 10.0
+
+@njit(cache=True)
+def score_batch(ages, deps, incomes, fixeds, vars_, industries, growths, assets, withdraws):
+    """
+    Calculates risk capacity scores for many people (or scenarios) at once.
+
+    Every argument is a NumPy array of the same length; position i of each array
+    describes person i. Industries are int8 codes from INDUSTRY_CODES.
+    The people are scored one after another in a plain loop rather than in parallel
+    (parallel=True/prange): an uploaded CSV is small, and Numba's parallel loops are
+    not safe to run from several Streamlit sessions (threads) at the same time with
+    every threading layer - with the "workqueue" layer it aborts the whole server.
+
+    Returns:
+    numpy.ndarray: One risk capacity score (0-100) per person
+    """
+    n = ages.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for i in range(n):
+        out[i] = score_one(
+            np.int64(ages[i]), np.int64(deps[i]), incomes[i], fixeds[i], vars_[i],
+            np.int64(industries[i]), growths[i], assets[i], withdraws[i],
+        )
+    return out
@@ -0,0 +1,410 @@
+"""
+Risk Scoring Core for the Risk Capacity Estimator
+
+This module holds the scoring logic behind the calculator, without any
+Streamlit code:
+- the weights of the risk capacity factors and their ranking
+- the sensitivity scenarios (what happens if income or assets change)
+- the risk requirement score and its map_* functions
+
+The capacity subscores themselves (map_sli, map_age, ...) and the capacity
+total live only in core_numba, so each formula is written down exactly once.
+This module can also be imported on its own (e.g. `python -c "import risk_core"`)
+to test or time the scoring.
+
+Author: istaawoo
+License: See LICENSE file
+"""
+
+# Import necessary Python libraries
+# numpy: Fast numeric helpers for the sensitivity scenarios
+# core_numba: Compiled (Numba) capacity subscores and total
+
+import numpy as np
+
+import core_numba
+
+# The names other modules (e.g. streamlit_app.py) are meant to import from here;
+# everything else in this file is a helper behind these
+__all__ = [
+    "WEIGHTS",
+    "ORDERED_KEYS",
+    "RANK_MAP",
+    "WEIGHT_KEYS",
+    "WEIGHTS_ARR",
+    "SENSITIVITY_LABELS",
+    "sensitivity_scores",
+    "compute_risk_requirement",
+    "REQ_WEIGHTS",
+]
+
+# -----------------------
+# Risk Capacity Scoring Weights
+# -----------------------
+# These weights determine how important each factor is in calculating the final risk capacity score.
+# The weights add up to 100% (100.0) and represent the relative importance of each factor.
+
+WEIGHTS = {
+    # Savings Longevity Index: Most important (25%)
+    # Shows how long savings would last. Higher weight because it directly measures financial cushion.
+    "SLI": 25.0,
+
+    # Income-to-Expenses Ratio: Second most important (20%)
+    # Shows ability to cover expenses. Critical for ongoing financial stability.
+    "Income": 20.0,
+
+    # Emergency Fund Coverage: Third most important (15%)
+    # Shows short-term financial safety net. Important for unexpected expenses.
+    "Expenses": 15.0,
+
+    # Industry Stability: Fourth most important (12%)
+    # Shows job security and income reliability.
+    "Industry": 12.0,
+
+    # Age: Equal to Industry (12%)
+    # Shows investment time horizon and ability to recover from losses.
+    "Age": 12.0,
+
+    # Expected Salary Growth: Less important (8%)
+    # Shows future earning potential. Less weight as it's less certain.
+    "Growth": 8.0,
+
+    # Number of Dependents: Less important (8%)
+    # Shows financial obligations. Less weight but still impacts flexibility.
+    "Dependents": 8.0,
+}
+
+# Factors ranked by weight (most important first), used to order the breakdown table.
+# WEIGHTS never changes while the app runs, so the ranking is worked out once here.
+SORTED_WEIGHTS = tuple(sorted(WEIGHTS.items(), key=lambda kv: -kv[1]))
+ORDERED_KEYS = tuple(k for k, _ in SORTED_WEIGHTS)
+RANK_MAP = {k: i + 1 for i, (k, _) in enumerate(SORTED_WEIGHTS)}
+
+# The same weights as whole numbers (whole percents), as core_numba uses them
+WEIGHTS_INT = {k: int(w) for k, w in WEIGHTS.items()}
+
+# The scores rely on the weights adding up to exactly 100% (see core_numba.capacity_tenths).
+# (Checked with an explicit raise rather than assert, so it also runs under python -O.)
+if sum(WEIGHTS_INT.values()) != 100:
+    raise ValueError("WEIGHTS must add up to exactly 100")
+
+# The factor names in a fixed order, and the whole-number weights as an array in that
+# same order (the order core_numba.capacity_tenths() adds the weighted subscores in).
+WEIGHT_KEYS = tuple(WEIGHTS)
+WEIGHTS_ARR = np.array([WEIGHTS_INT[k] for k in WEIGHT_KEYS], dtype=np.int64)
+
+# core_numba keeps its own copy of the weights (Numba compiles them in as constants),
+# so check here that both copies agree
+if not np.array_equal(WEIGHTS_ARR, core_numba.WEIGHTS_ARR):
+    raise ValueError("core_numba.WEIGHTS_ARR differs from WEIGHTS")
+
+# The sensitivity scenarios: income and investable assets each move down and up by 20%
+# (e.g. lower pay or using savings, versus a raise or portfolio gains)
+SENSITIVITY_MULTIPLIERS = np.array([0.8, 1.2])
+SENSITIVITY_LABELS = ("-20%", "+20%")
+
+# The two factors the scenarios change (row 0: Income, row 1: SLI) as positions in
+# WEIGHT_KEYS order. They never change, so they are looked up once here rather than
+# on every sensitivity_scores() call.
+SENSITIVITY_COLS = (WEIGHT_KEYS.index("Income"), WEIGHT_KEYS.index("SLI"))
+
+def sensitivity_scores(subscores: np.ndarray, annual_income: float,
+                       investable_assets: float, denom_expenses: float, denom_withdraw: float) -> np.ndarray:
+    """
+    Calculates the risk capacity score for every sensitivity scenario at once.
+    
+    Changing income only changes the Income subscore, and changing investable assets
+    only changes the SLI subscore. So each scenario is the current subscores with that
+    one subscore replaced (from the compiled core_numba maps, the same ones the main
+    score uses), scored with core_numba.capacity_tenths() exactly like the main score.
+    
+    Parameters:
+    subscores (numpy.ndarray): Current risk capacity subscores in WEIGHT_KEYS order
+    annual_income, investable_assets (float): Income and assets (USD)
+    denom_expenses (float): max(1.0, annual fixed + variable expenses), as used for the income ratio
+    denom_withdraw (float): max(1.0, annual withdrawals), as used for the SLI
+    
+    Returns:
+    numpy.ndarray: 2 x len(SENSITIVITY_MULTIPLIERS) scores (0-100, 1 decimal place);
+        row 0 changes income, row 1 changes investable assets
+    """
+    base = np.asarray(subscores, dtype=np.float64)
+
+    # New Income and SLI subscores for every multiplier, one row per factor
+    income_ratios = (annual_income * SENSITIVITY_MULTIPLIERS) / denom_expenses
+    sli_values = (investable_assets * SENSITIVITY_MULTIPLIERS) / denom_withdraw
+    new_subscores = (
+        [core_numba.map_income_ratio(r) for r in income_ratios],
+        [core_numba.map_sli(v) for v in sli_values],
+    )
+
+    scores = np.empty((len(SENSITIVITY_COLS), len(SENSITIVITY_MULTIPLIERS)))
+    for row, (col, row_subscores) in enumerate(zip(SENSITIVITY_COLS, new_subscores)):
+        scenario = base.copy()
+        for j, new_subscore in enumerate(row_subscores):
+            scenario[col] = new_subscore
+            scores[row, j] = core_numba.capacity_tenths(scenario) / 10.0
+    return scores
+
+def compute_risk_requirement(rrr: float, real_req_pct: float, shortfall_pct: float, draw_ratio: float):
+    """
+    Calculates how much investment risk is needed to achieve financial goals.
+    
+    This function determines if your financial goals require you to:
+    1. Take minimal risk (conservative investing may be enough)
+    2. Take moderate risk (balanced investing needed)
+    3. Take high risk (aggressive investing required)
+    
+    Parameters:
+    rrr (float): Required Rate of Return as decimal (e.g., 0.07 means 7% per year)
+        - This is the annual growth rate needed to reach your target
+        - Example: To grow $100,000 to $200,000 in 10 years needs about 7% per year
+        
+    real_req_pct (float): Real required return percentage after inflation
+        - Shows how much growth you need above inflation
+        - Example: If you need 7% growth and inflation is 2%, real return needed is 5%
+        
+    shortfall_pct (float): Gap between what you need and what you expect to get
+        - Positive means you need more return than you expect
+        - Example: If you need 5% but expect 3%, shortfall is 2%
+        
+    draw_ratio (float): How well you can handle market drops
+        - Ratio of typical market drops to what you can tolerate
+        - Example: If markets typically drop 30% but you can only handle 15%,
+                  ratio is 2.0 (suggests high risk)
+    
+    Returns:
+    tuple: (requirement10, subscores)
+        - requirement10 (int): Final risk requirement in whole tenths of a point
+          (100-900, e.g. 795 means a score of 79.5)
+        - subscores (Dict[str, float]): Individual scores for each factor
+    """
+    # Map RRR (as percent)
+    rrr_pct = rrr * 100.0
+    if rrr_pct <= 2.0:
+        rrr_s = 10.0
+    elif rrr_pct <= 5.0:
+        rrr_s = 35.0
+    elif rrr_pct <= 10.0:
+        rrr_s = 65.0
+    else:
+        rrr_s = 90.0
+
+    # Map Real requirement percent
+    if real_req_pct <= 0.0:
+        real_s = 10.0
+    elif real_req_pct <= 2.0:
+        real_s = 40.0
+    elif real_req_pct <= 5.0:
+        real_s = 70.0
+    else:
+        real_s = 90.0
+
+    # Map shortfall: more shortfall -> higher requirement
+    if shortfall_pct <= 0.0:
+        short_s = 10.0
+    elif shortfall_pct <= 2.0:
+        short_s = 30.0
+    elif shortfall_pct <= 5.0:
+        short_s = 60.0
+    else:
+        short_s = 90.0
+
+    # Map drawdown pressure: higher means riskier to reach goal
+    if draw_ratio <= 0.5:
+        draw_s = 10.0
+    elif draw_ratio <= 1.0:
+        draw_s = 40.0
+    elif draw_ratio <= 2.0:
+        draw_s = 70.0
+    else:
+        draw_s = 90.0
+
+    # Weights: RRR is most important
+    REQ_WEIGHTS = {"RRR": 35, "RealReq": 25, "Shortfall": 25, "DrawPressure": 15}
+    subs = {"RRR": rrr_s, "RealReq": real_s, "Shortfall": short_s, "DrawPressure": draw_s}
+    # Every subscore above is a whole number, so the weighted total is an exact
+    # whole number of hundredths of a point (e.g. 2625 means 26.25)
+    total = sum(REQ_WEIGHTS[k] * int(subs[k]) for k in REQ_WEIGHTS)
+    return requirement_total_to_tenths(total), subs
+
+def requirement_total_to_tenths(total: int) -> int:
+    """
+    Rounds a weighted requirement total (in hundredths of a point) to whole tenths.
+    
+    Uses whole-number arithmetic only. A value exactly halfway between two tenths
+    goes to the even tenth (26.25 -> 26.2, 26.75 -> 26.8), which is what Python's
+    round(score, 1) did for these scores. No clamp to 0-100 is needed: every
+    subscore is between 10 and 90 and the weights add up to 100.
+    
+    Returns:
+    int: Risk requirement score in tenths of a point (100-900)
+    """
+    tenths, rest = divmod(total, 10)
+    if rest > 5 or (rest == 5 and tenths % 2 == 1):
+        tenths += 1
+    return tenths
+
+
+# -----------------------
+# Risk Requirement Assessment Functions
+# -----------------------
+
+def map_rrr(rrr: float) -> float:
+    """
+    Calculates a risk score (0-100) based on Required Rate of Return (RRR).
+    
+    The Required Rate of Return is how much your investments need to grow 
+    each year to reach your financial goal. Higher required returns usually
+    mean you need to take more investment risk.
+    
+    Parameters:
+    rrr (float): Required annual return as decimal (0.07 means 7% per year)
+    
+    Returns:
+    float: Risk requirement score (0-100) where:
+    - 0 for required returns <= 3% (very low risk needed)
+    - 25 for required returns around 6% (moderate risk needed)
+    - 60 for required returns around 10% (high risk needed)
+    - 85+ for required returns > 15% (very high risk needed)
+    
+    Example:
+    If you need your money to grow 8% per year:
+    rrr = 0.08 (8%)
+    This would return a moderate-high risk requirement around 45
+    """
+    # Convert decimal to percentage for easier thresholds
+    p = rrr * 100.0
+    
+    if p <= 3.0:  # Very conservative return needed
+        return 0.0
+    if p <= 6.0:  # Conservative to moderate return needed
+        return (p - 3.0) / (6.0 - 3.0) * 25.0
+    if p <= 10.0:  # Moderate to aggressive return needed
+        return 25.0 + (p - 6.0) / (10.0 - 6.0) * 35.0
+    if p <= 15.0:  # Aggressive return needed
+        return 60.0 + (p - 10.0) / (15.0 - 10.0) * 25.0
+    # Very aggressive return needed (capped at 100)
+    return 85.0 + min(p - 15.0, 15.0) / 15.0 * 15.0
+
+def map_realreq(real_pct: float) -> float:
+    """
+    Calculates a risk score (0-100) based on real (inflation-adjusted) required return.
+    
+    Real required return shows how much your investments need to grow above inflation.
+    For example, if you need 7% growth and inflation is 2%, your real required return
+    is 5%. This matters because inflation reduces your purchasing power over time.
+    
+    Parameters:
+    real_pct (float): Required return above inflation, in percentage points
+    
+    Returns:
+    float: Risk requirement score (0-100) where:
+    - 0 for real return <= 0% (no growth needed above inflation)
+    - 25 for real return around 2% (modest growth needed)
+    - 65 for real return around 5% (significant growth needed)
+    - 100 for real return > 15% (very high growth needed)
+    
+    Example:
+    If you need 3% growth above inflation:
+    real_pct = 3.0
+    This would return a moderate risk requirement around 45
+    """
+    if real_pct <= 0.0:  # No real growth needed
+        return 0.0
+    if real_pct <= 2.0:  # Modest real growth needed
+        return (real_pct / 2.0) * 25.0
+    if real_pct <= 5.0:  # Moderate real growth needed
+        return 25.0 + (real_pct - 2.0) / (5.0 - 2.0) * 40.0
+    # Significant real growth needed
+    return 65.0 + min(real_pct - 5.0, 10.0) / 10.0 * 35.0
+
+def map_shortfall(short_pct: float) -> float:
+    """
+    Calculates a risk score (0-100) based on return shortfall.
+    
+    Shortfall is the gap between what return you need and what you expect to get.
+    A positive shortfall means you need to find additional return through taking
+    more risk. The larger the shortfall, the more risk you might need to take.
+    
+    Parameters:
+    short_pct (float): Return shortfall in percentage points
+        = Required return - Expected return
+    
+    Returns:
+    float: Risk requirement score (0-100) where:
+    - 0 for no shortfall (expected return meets or exceeds required)
+    - 50 for 5% shortfall (moderate additional return needed)
+    - 100 for 10% or greater shortfall (significant additional return needed)
+    
+    Example:
+    If you need 8% return but expect 6%:
+    short_pct = 8 - 6 = 2
+    This would return a risk requirement of 20
+    """
+    if short_pct <= 0:  # No shortfall
+        return 0.0
+    # Linear mapping: 0-10% shortfall maps to 0-100 score
+    return min(100.0, (short_pct / 10.0) * 100.0)
+
+def map_drawimpact(draw_ratio: float) -> float:
+    """
+    Calculates a risk score (0-100) based on drawdown impact ratio.
+    
+    The drawdown ratio compares typical market drops to what you can tolerate:
+    Ratio = Average market drawdown / Your drawdown tolerance
+    
+    A high ratio means the investment approach you need might have bigger
+    drops than you're comfortable with, indicating higher risk.
+    
+    Parameters:
+    draw_ratio (float): Ratio of average drawdown to drawdown tolerance
+    
+    Returns:
+    float: Risk requirement score (0-100) where:
+    - 0 for ratio <= 0.5 (market drops well within tolerance)
+    - 25 for ratio around 1.0 (drops match tolerance)
+    - 60 for ratio around 1.5 (drops exceed tolerance)
+    - 100 for ratio > 1.5 (drops significantly exceed tolerance)
+    
+    Example:
+    If markets typically drop 30% but you can only tolerate 20%:
+    draw_ratio = 30 / 20 = 1.5
+    This would return a high risk requirement of 60
+    """
+    if draw_ratio <= 0.5:  # Drops well within tolerance
+        return 0.0
+    if draw_ratio <= 1.0:  # Drops approaching tolerance
+        return 25.0
+    if draw_ratio <= 1.5:  # Drops exceeding tolerance
+        return 60.0
+    return 100.0  # Drops far exceeding tolerance
+
+# -----------------------
+# Risk Requirement Scoring Weights
+# -----------------------
+# These weights determine how important each factor is in calculating how much
+# risk you need to take to reach your financial goals.
+# The weights add up to 100% (100.0).
+
+REQ_WEIGHTS = {
+    # Required Rate of Return: Most important (40%)
+    # Raw growth rate needed to reach your target. Heavily weighted because
+    # it directly shows how ambitious your goal is.
+    "RRR": 40.0,
+    
+    # Real Required Return: Second most important (25%)
+    # Growth needed after inflation. Important because it shows true
+    # purchasing power growth needed.
+    "RealReq": 25.0,
+    
+    # Return Shortfall: Third most important (20%)
+    # Gap between needed and expected returns. Shows how much additional
+    # return you need to find through taking risk.
+    "Shortfall": 20.0,
+    
+    # Drawdown Impact: Fourth most important (15%)
+    # How market drops compare to your tolerance. Less weight but important
+    # for understanding if the required strategy matches your comfort level.
+    "DrawImpact": 15.0,
+}
@@ -23,15 +23,33 @@ License: See LICENSE file
 
 # Import necessary Python libraries
 # streamlit: Creates web interfaces for Python applications
-# pandas: Handles data analysis and calculations
+# numpy: Fast numeric helpers
 # math: Provides mathematical functions
-# typing: Helps with type hints for better code understanding
-
-from typing import Dict
+# bisect, functools: Fast range lookups and caching of repeated results
+# csv, io: Reading the uploaded batch scoring file
+# core_numba: Compiled (Numba) versions of the scoring functions used on every rerun
+# risk_core: Weights, sensitivity scenarios and the risk requirement score
+#            (see risk_core.py); this file only adds the web interface on top of them
+
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+import csv
+import io
 import streamlit as st
-import pandas as pd
+import numpy as np
 import math
 
+import core_numba
+from risk_core import (
+    WEIGHTS,
+    ORDERED_KEYS,
+    RANK_MAP,
+    WEIGHT_KEYS,
+    SENSITIVITY_LABELS,
+    sensitivity_scores,
+    compute_risk_requirement,
+)
+
 # -----------------------
 # Configuration: Step Sizes for Input Fields
 # -----------------------
@@ -55,642 +73,816 @@ STEP_WITHDRAW = 100
 # Percentage points by which expected salary growth changes per step
 STEP_GROWTH = 0.1
 
+# Choices of the industry stability question, taken from the industry codes in
+# core_numba (INDUSTRY_CODES) so the two can never disagree
+INDUSTRY_OPTIONS = tuple(core_numba.INDUSTRY_CODES)
+
 # -----------------------
-# Risk Capacity Assessment Functions
+# Helper Functions for Formatting and User-Friendly Output
 # -----------------------
 
-def map_sli(sli: float) -> float:
+def fmt_num(x: float) -> str:
     """
-    Calculates a risk score (0-100) based on the Savings Longevity Index (SLI).
+    Formats numbers to be more readable by removing unnecessary decimals.
     
-    SLI measures how many years your savings could last if you had to live off them:
-    SLI = Total Investable Assets / Annual Withdrawals
+    This function makes numbers look cleaner by:
+    1. Converting whole numbers to integers (e.g., 5.0 becomes 5)
+    2. Keeping one decimal place for non-whole numbers
+    3. Removing trailing zeros after decimal points
     
     Parameters:
-    sli (float): Number of years savings would last at current withdrawal rate
+    x (float): The number to format
     
     Returns:
-    float: Risk capacity score (0-100) where:
-    - 0 means very low capacity (savings last less than 1 year)
-    - 40 means moderate capacity (savings last 5 years)
-    - 80 means high capacity (savings last 20 years)
-    - 100 means maximum capacity (savings last 50+ years)
+    str: A cleanly formatted string representation of the number
     
-    Example:
-    If someone has $100,000 in savings and withdraws $20,000/year:
-    SLI = 100,000 / 20,000 = 5 years
-    This would return a moderate risk capacity score around 40
+    Examples:
+    fmt_num(5.0) -> "5"
+    fmt_num(5.5) -> "5.5"
+    fmt_num(5.50) -> "5.5"
     """
-    if sli <= 1.0:  # Savings last less than 1 year
-        return 0.0
-    if 1.0 < sli <= 5.0:  # Savings last 1-5 years
-        return 1.0 + (sli - 1.0) / (5.0 - 1.0) * (40.0 - 1.0)
-    if 5.0 < sli <= 20.0:  # Savings last 5-20 years
-        return 40.0 + (sli - 5.0) / (20.0 - 5.0) * (80.0 - 40.0)
-    if 20.0 < sli <= 50.0:  # Savings last 20-50 years
-        return 80.0 + (sli - 20.0) / (50.0 - 20.0) * (95.0 - 80.0)
-    if sli > 50.0:  # Savings last more than 50 years
-        mapped = 95.0 + (min(sli, 200.0) - 50.0) / (200.0 - 50.0) * (100.0 - 95.0)
-        return min(mapped, 100.0)
-    return 0.0
-
-def map_income_ratio(r: float) -> float:
+    if abs(x - round(x)) < 1e-9:  # If x is effectively a whole number
+        return str(int(round(x)))
+    # For non-whole numbers, round to 1 decimal and remove unnecessary zeros
+    return f"{round(x,1):.1f}".rstrip('0').rstrip('.')
+
+# Zone boundaries for the metrics whose explanation depends on a range.
+# A value falls in zone 0 if it is <= the first boundary, zone 1 if it is <= the second, etc.
+ZONE_BOUNDS = {
+    "SLI": (1.0, 5.0, 20.0),        # Years of savings
+    "Income": (1.0, 1.5, 2.5),      # Income to expenses ratio
+    "Expenses": (1.0, 3.0, 6.0),    # Months of emergency cushion
+}
+
+# Sentence templates for every metric and zone; {} is replaced by the formatted value
+ZONE_TEMPLATES = {
+    # Savings Longevity Index (SLI): larger SLI => stronger resilience to withdrawals and shocks
+    "SLI": (
+        "SLI = {} years - No meaningful liquid cushion (<=1 year). Larger SLI => stronger resilience to withdrawals and shocks.",
+        "SLI = {} years - Low cushion (1-5 years). Larger SLI => stronger resilience to withdrawals and shocks.",
+        "SLI = {} years - Moderate cushion (5-20 years). Larger SLI => stronger resilience to withdrawals and shocks.",
+        "SLI = {} years - Very strong cushion (>20 years). Larger SLI => stronger resilience to withdrawals and shocks.",
+    ),
+    # Income to Expenses Ratio: from no positive cash flow up to a very strong buffer
+    "Income": (
+        "Income ratio = {} - Income <= expenses (high forced selling risk).",
+        "Income ratio = {} - Income modestly above expenses.",
+        "Income ratio = {} - Income comfortably above expenses.",
+        "Income ratio = {} - High income vs expenses (strong buffer).",
+    ),
+    # Emergency Fund Coverage: from a very limited to a strong safety net
+    "Expenses": (
+        "Emergency months = {} - Under 1 month emergency cushion.",
+        "Emergency months = {} - 1-3 months.",
+        "Emergency months = {} - 3-6 months.",
+        "Emergency months = {} - 6+ months.",
+    ),
+    # Industry Stability: how stable employment in their industry typically is
+    "Industry": ("Industry stability = {}. Stable industries imply reduced income disruption risk.",),
+    # Age Factor: how age affects ability to recover from financial setbacks
+    "Age": ("Age = {}. Younger investors have longer recovery horizons (higher capacity).",),
+    # Expected Salary Growth: how future salary increases affect financial flexibility
+    "Growth": ("Expected salary growth = {}% p.a. Higher growth increases future capacity.",),
+    # Number of Dependents: how financial obligations affect risk capacity
+    "Dependents": ("Dependents = {}. More dependents reduce discretionary capacity.",),
+}
+
+def fmt_score10(score10: int) -> str:
     """
-    Calculates a risk score (0-100) based on the Income-to-Expenses Ratio.
+    Formats a score kept in whole tenths of a point (826 means 82.6) for display.
     
-    This ratio shows how well your income covers your expenses:
-    Ratio = Annual Income / (Annual Fixed Expenses + Annual Variable Expenses)
+    Works only with whole numbers, so there are no floating point rounding
+    surprises, and shows the same text as fmt_num() would for the decimal score.
     
     Parameters:
-    r (float): Income-to-Expenses ratio
+    score10 (int): The score (or score difference) in tenths of a point
     
     Returns:
-    float: Risk capacity score (0-100) where:
-    - 10 means very low capacity (income barely covers or doesn't cover expenses)
-    - 40 means moderate capacity (income is 1.5x expenses)
-    - 75 means high capacity (income is 2.5x expenses)
-    - 100 means maximum capacity (income is 10x or more than expenses)
+    str: The score with one decimal place, or without decimals for whole numbers
     
-    Example:
-    If someone earns $60,000/year and has $30,000 in total expenses:
-    Ratio = 60,000 / 30,000 = 2.0
-    This would return a moderate-to-high risk capacity score around 60
+    Examples:
+    fmt_score10(826) -> "82.6"
+    fmt_score10(800) -> "80"
+    fmt_score10(-35) -> "-3.5"
     """
-    if r <= 1.0:  # Income is less than or equal to expenses
-        return 10.0
-    if 1.0 < r <= 1.5:  # Income is 1-1.5x expenses
-        return 10.0 + (r - 1.0) / (1.5 - 1.0) * (40.0 - 10.0)
-    if 1.5 < r <= 2.5:  # Income is 1.5-2.5x expenses
-        return 40.0 + (r - 1.5) / (2.5 - 1.5) * (75.0 - 40.0)
-    # Income is more than 2.5x expenses (capped at 10x)
-    mapped = 75.0 + (min(r, 10.0) - 2.5) / (10.0 - 2.5) * (100.0 - 75.0)
-    return min(mapped, 100.0)
-
-def map_emergency_months(months: float) -> float:
+    if score10 < 0:
+        return "-" + fmt_score10(-score10)
+    whole, tenth = divmod(score10, 10)
+    if tenth == 0:
+        return str(whole)
+    return f"{whole}.{tenth}"
+
+
+def zone_bucket(component: str, raw_value: float) -> int:
     """
-    Calculates a risk score (0-100) based on Emergency Fund coverage.
-    
-    Emergency Fund coverage shows how many months you could cover expenses with savings:
-    Months = Total Investable Assets / Monthly Expenses
+    Finds which zone (0, 1, 2, ...) a metric's value falls into.
     
     Parameters:
-    months (float): Number of months expenses could be covered by savings
+    component (str): The type of financial metric (SLI, Income, etc.)
+    raw_value (float): The actual numerical value of the metric
     
     Returns:
-    float: Risk capacity score (0-100) where:
-    - 5 means very low capacity (less than 1 month of expenses covered)
-    - 40 means moderate capacity (3 months of expenses covered)
-    - 70 means high capacity (6 months of expenses covered)
-    - 100 means maximum capacity (24+ months of expenses covered)
-    
-    Example:
-    If someone has $30,000 in savings and $5,000 in monthly expenses:
-    Months = 30,000 / 5,000 = 6 months
-    This would return a high risk capacity score of 70
+    int: Zone number used to pick the sentence in ZONE_TEMPLATES
+        (always 0 for metrics that only have one sentence)
     """
-    if months <= 1.0:  # Less than 1 month of emergency funds
-        return 5.0
-    if 1.0 < months <= 3.0:  # 1-3 months of emergency funds
-        return 20.0 + (months - 1.0) / (3.0 - 1.0) * (40.0 - 20.0)
-    if 3.0 < months <= 6.0:  # 3-6 months of emergency funds
-        return 40.0 + (months - 3.0) / (6.0 - 3.0) * (70.0 - 40.0)
-    # More than 6 months of emergency funds (capped at 24 months)
-    mapped = 70.0 + (min(months, 24.0) - 6.0) / (24.0 - 6.0) * (100.0 - 70.0)
-    return min(mapped, 100.0)
-
-def map_industry(s: str) -> float:
+    bounds = ZONE_BOUNDS.get(component)
+    if bounds is None:
+        return 0
+    # bisect_left puts a value equal to a boundary into the lower zone (<= comparisons)
+    return bisect_left(bounds, raw_value)
+
+@lru_cache(maxsize=256)
+def zone_text(component: str, bucket: int, display: str) -> str:
     """
-    Calculates a risk score (0-100) based on industry stability.
-    
-    Different industries have different levels of job security and income stability.
-    For example:
-    - Stable: Government, Healthcare, Utilities
-    - Moderate: Technology, Manufacturing, Education
-    - Unstable: Startups, Real Estate, Entertainment
-    
-    Parameters:
-    s (str): Industry stability category ("Stable", "Moderate", or "Unstable")
+    Builds (and remembers) the explanation sentence for one metric, zone and value.
     
-    Returns:
-    float: Risk capacity score where:
-    - 90 for Stable industries (high job security)
-    - 60 for Moderate industries (average job security)
-    - 25 for Unstable industries (low job security)
-    Default is 60 if category is not recognized
+    The same few sentences come up again and again while the user edits the form,
+    so they are cached instead of being formatted on every rerun.
     """
-    m = {"Stable": 90.0, "Moderate": 60.0, "Unstable": 25.0}
-    return float(m.get(s, 60.0))
+    templates = ZONE_TEMPLATES.get(component)
+    if templates is None:
+        return ""
+    return templates[bucket].format(display)
 
-def map_age(age: int) -> float:
+def zone_sentence(component: str, raw_value: float) -> str:
     """
-    Calculates a risk score (0-100) based on age.
+    Creates a human-readable explanation of what different financial metrics mean.
     
-    Younger people generally can take more investment risk because they:
-    1. Have more time to recover from market downturns
-    2. Usually have more earning years ahead
-    3. Can adjust their financial strategy over time
+    This function takes a financial metric (like savings longevity or income ratio)
+    and translates its numerical value into plain English that explains:
+    1. What the number means
+    2. Which category or zone the number falls into
+    3. Why this number matters for financial planning
     
     Parameters:
-    age (int): Person's age in years
+    component (str): The type of financial metric (SLI, Income, etc.)
+    raw_value (float): The actual numerical value of the metric
     
     Returns:
-    float: Risk capacity score where:
-    - 90 for age <= 30 (highest risk capacity)
-    - 75 for ages 31-40
-    - 50 for ages 41-55
-    - 30 for ages 56-65
-    - 10 for ages > 65 (lowest risk capacity)
+    str: A complete sentence explaining the metric's value and significance
+        (empty if the component type is not recognized)
     """
-    if age <= 30:  # Young adults with longest recovery horizon
-        return 90.0
-    if 31 <= age <= 40:  # Early career with good recovery time
-        return 75.0
-    if 41 <= age <= 55:  # Mid-career with moderate recovery time
-        return 50.0
-    if 56 <= age <= 65:  # Late career with limited recovery time
-        return 30.0
-    return 10.0  # Retirement age with shortest recovery time
-
-def map_growth(g: float) -> float:
+    # Format the value the way each metric is shown to the user
+    if component == "Income":
+        display = str(round(raw_value, 2))
+    elif component in ("Age", "Dependents"):
+        display = str(int(raw_value))
+    elif component == "Industry":
+        display = str(raw_value)
+    elif component in ZONE_TEMPLATES:
+        display = fmt_num(raw_value)
+    else:
+        return ""
+    return zone_text(component, zone_bucket(component, raw_value), display)
+
+# Column order of the downloadable CSV (the same order as the inputs on the page,
+# with each score after the inputs it is calculated from)
+CSV_COLUMNS = (
+    "age", "dependents", "annual_income", "annual_fixed", "annual_variable",
+    "industry", "expected_growth", "investable_assets", "annual_withdrawals",
+    "capacity_score", "target_wealth", "current_portfolio", "horizon_years",
+    "inflation", "expected_return", "avg_drawdown", "drawdown_tolerance",
+    "requirement_score",
+)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def build_results_csv(inputs: tuple, capacity10: int, requirement10: int) -> str:
     """
-    Calculates a risk score (0-100) based on expected salary growth.
+    Builds the downloadable CSV with all inputs and both final scores.
     
-    Higher expected salary growth allows for more risk-taking because:
-    1. Future higher income can offset investment losses
-    2. Increases future saving capacity
-    3. Provides more financial flexibility
+    Streamlit caches the result, so reruns with the same inputs (for example
+    opening an expander) reuse the CSV text instead of building it again.
+    A single data line needs no DataFrame, so it is written with Python's built-in
+    csv module, which also quotes any value that contains a comma or a quote.
     
     Parameters:
-    g (float): Expected annual salary growth percentage
+    inputs (tuple): All form inputs, in the order they appear on the page:
+        (age, dependents, annual_income, annual_fixed, annual_variable,
+         industry, expected_growth, investable_assets, annual_withdrawals,
+         target_wealth, current_portfolio, horizon_years,
+         inflation, expected_return, avg_drawdown, drawdown_tolerance)
+    capacity10 (int): Final risk capacity score in tenths of a point
+    requirement10 (int): Final risk requirement score in tenths of a point
     
     Returns:
-    float: Risk capacity score where:
-    - 10 for negative growth (declining income)
-    - 30 for 0-2% growth (below inflation)
-    - 60 for 2-5% growth (moderate growth)
-    - 85 for > 5% growth (high growth)
+    str: One header line (CSV_COLUMNS) and one data line in CSV format
     """
-    if g < 0.0:  # Declining income
-        return 10.0
-    if g < 2.0:  # Growth below typical inflation
-        return 30.0
-    if g < 5.0:  # Moderate growth
-        return 60.0
-    return 85.0  # High growth
-
-def map_dependents(d: int) -> float:
+    # The scores are written as usual 0-100 numbers with 1 decimal place
+    capacity_score = capacity10 / 10.0
+    requirement_score = requirement10 / 10.0
+
+    # The capacity score goes right after the nine capacity inputs (see CSV_COLUMNS)
+    values = inputs[:9] + (capacity_score,) + inputs[9:] + (requirement_score,)
+
+    # Write both lines into an in-memory text buffer (plain "\n" line endings)
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    writer.writerow(values)
+    return buf.getvalue()
+
+# Columns a batch CSV must have: the nine risk capacity inputs, named as in the
+# downloadable CSV (so downloaded results can be uploaded again). Extra columns are ignored.
+BATCH_COLUMNS = CSV_COLUMNS[:9]
+BATCH_INT_COLUMNS = ("age", "dependents")
+# The only batch column that may be negative (as on the form); all others must be 0 or more
+BATCH_SIGNED_COLUMNS = ("expected_growth",)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def score_uploaded_csv(data: bytes) -> list:
     """
-    Calculates a risk score (0-100) based on number of dependents.
+    Reads an uploaded CSV with one client per line and scores every client.
     
-    More dependents typically mean:
-    1. Higher fixed expenses (food, healthcare, education)
-    2. Less financial flexibility
-    3. Greater need for stable income
+    All clients are scored together in one compiled core_numba.score_batch() call
+    (the same formulas as the single-client score). Streamlit caches the result, so
+    reruns with the same file do not read and score it again.
     
     Parameters:
-    d (int): Number of financial dependents
+    data (bytes): The uploaded file contents (UTF-8 text with a header line
+        naming at least the BATCH_COLUMNS)
     
     Returns:
-    float: Risk capacity score where:
-    - 90 for 0 dependents (maximum flexibility)
-    - 70 for 1 dependent
-    - 50 for 2 dependents
-    - 30 for 3 dependents
-    - 15 for 4+ dependents (minimum flexibility)
-    """
-    if d == 0:  # No dependents
-        return 90.0
-    if d == 1:  # One dependent
-        return 70.0
-    if d == 2:  # Two dependents
-        return 50.0
-    if d == 3:  # Three dependents
-        return 30.0
-    return 15.0  # Four or more dependents
-
-# -----------------------
-# Risk Capacity Scoring Weights
-# -----------------------
-# These weights determine how important each factor is in calculating the final risk capacity score.
-# The weights add up to 100% (100.0) and represent the relative importance of each factor.
-
-WEIGHTS = {
-    # Savings Longevity Index: Most important (25%)
-    # Shows how long savings would last. Higher weight because it directly measures financial cushion.
-    "SLI": 25.0,
-
-    # Income-to-Expenses Ratio: Second most important (20%)
-    # Shows ability to cover expenses. Critical for ongoing financial stability.
-    "Income": 20.0,
-
-    # Emergency Fund Coverage: Third most important (15%)
-    # Shows short-term financial safety net. Important for unexpected expenses.
-    "Expenses": 15.0,
-
-    # Industry Stability: Fourth most important (12%)
-    # Shows job security and income reliability.
-    "Industry": 12.0,
-
-    # Age: Equal to Industry (12%)
-    # Shows investment time horizon and ability to recover from losses.
-    "Age": 12.0,
-
-    # Expected Salary Growth: Less important (8%)
-    # Shows future earning potential. Less weight as it's less certain.
-    "Growth": 8.0,
-
-    # Number of Dependents: Less important (8%)
-    # Shows financial obligations. Less weight but still impacts flexibility.
-    "Dependents": 8.0,
-}
-
-def compute_risk_capacity(subscores: Dict[str, float]) -> float:
-    """
-    Calculates the final risk capacity score by combining all individual factor scores.
-    
-    This function:
-    1. Takes the individual scores for each factor (SLI, Income, etc.)
-    2. Multiplies each score by its importance weight
-    3. Adds all weighted scores together
-    4. Ensures the final score is between 0 and 100
-    
-    Parameters:
-    subscores (Dict[str, float]): Dictionary containing scores for each factor
-        Example: {
-            'SLI': 75.0,       # Good savings longevity
-            'Income': 60.0,     # Moderate income ratio
-            'Expenses': 40.0,   # Fair emergency coverage
-            'Industry': 90.0,   # Very stable industry
-            'Age': 75.0,       # Good age for risk
-            'Growth': 30.0,     # Low expected growth
-            'Dependents': 50.0  # Moderate dependent burden
-        }
+    list: One dict per client with the BATCH_COLUMNS values and its capacity_score,
+        ready for st.dataframe
     
-    Returns:
-    float: Final risk capacity score (0-100) rounded to 1 decimal place
-        0 = Minimum risk capacity (very conservative)
-        50 = Moderate risk capacity
-        100 = Maximum risk capacity (very aggressive)
+    Raises:
+    ValueError: If a column is missing, there are no clients, a value is not a
+        number the form would accept (e.g. "nan", "inf", a negative amount, or a
+        fraction of a year or dependent), or an industry is not one of the choices
     """
-    # Calculate weighted sum of all factor scores
-    total = sum(WEIGHTS[k] * float(subscores[k]) for k in WEIGHTS.keys())
-    
-    # Convert to 0-100 scale and ensure it stays within bounds
-    score = total / 100.0
-    return round(max(0.0, min(100.0, score)), 1)
-
-def compute_risk_requirement(rrr: float, real_req_pct: float, shortfall_pct: float, draw_ratio: float):
+    # utf-8-sig also accepts files saved by Excel (which start with a byte-order mark)
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8-sig")))
+    missing = [name for name in BATCH_COLUMNS if name not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError("The CSV is missing these columns: " + ", ".join(missing))
+    records = list(reader)
+    if not records:
+        raise ValueError("The CSV has a header line but no clients.")
+
+    # Turn each column into an array of numbers (industry names become the small
+    # number codes the compiled scoring core uses)
+    columns = []
+    for name in BATCH_COLUMNS:
+        cells = [(rec[name] or "").strip() for rec in records]
+        if name == "industry":
+            # Only the form's choices are accepted (e.g. not "stable"), rather than
+            # silently scoring an unrecognized name like Moderate
+            if any(v not in core_numba.INDUSTRY_CODES for v in cells):
+                raise ValueError("Column 'industry' must contain only Stable, Moderate or Unstable.")
+            columns.append(np.array([core_numba.INDUSTRY_CODES[v] for v in cells], dtype=np.int8))
+            continue
+        whole = name in BATCH_INT_COLUMNS
+        signed = name in BATCH_SIGNED_COLUMNS
+        values = []
+        for v in cells:
+            # Whole-number columns also accept "39.0", as spreadsheets often write it
+            try:
+                x = float(v)
+            except ValueError:
+                x = math.nan
+            # Reject anything the form would not accept: "nan" and "inf" would turn
+            # into meaningless scores, and amounts (and ages) cannot be negative.
+            # Whole numbers must also fit exactly in a float (below 2**53).
+            if (not math.isfinite(x)
+                    or (x < 0 and not signed)
+                    or (whole and not (x.is_integer() and x < 2 ** 53))):
+                kind = "whole numbers" if whole else "numbers"
+                if not signed:
+                    kind += " of 0 or more"
+                raise ValueError(f"Column '{name}' must contain only {kind}.")
+            values.append(x)
+        columns.append(np.array(values, dtype=np.int64 if whole else np.float64))
+
+    scores = core_numba.score_batch(*columns)
+    return [
+        {**{name: rec[name] for name in BATCH_COLUMNS}, "capacity_score": score}
+        for rec, score in zip(records, scores.tolist())
+    ]
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def compute_capacity(age: int, dependents: int, annual_income: float, annual_fixed: float,
+                     annual_variable: float, industry: str, expected_growth: float,
+                     investable_assets: float, annual_withdrawals: float):
     """
-    Calculates how much investment risk is needed to achieve financial goals.
+    Runs the whole risk capacity calculation for one set of inputs: the score,
+    the breakdown table and the sensitivity scenarios.
     
-    This function determines if your financial goals require you to:
-    1. Take minimal risk (conservative investing may be enough)
-    2. Take moderate risk (balanced investing needed)
-    3. Take high risk (aggressive investing required)
+    Streamlit caches the result, so the same inputs (from any browser session)
+    skip the calculation and reuse the stored score and table rows. Everything
+    the results page shows about risk capacity comes from this one call, so a
+    rerun with unchanged inputs (e.g. opening an expander) is a single lookup.
     
     Parameters:
-    rrr (float): Required Rate of Return as decimal (e.g., 0.07 means 7% per year)
-        - This is the annual growth rate needed to reach your target
-        - Example: To grow $100,000 to $200,000 in 10 years needs about 7% per year
-        
-    real_req_pct (float): Real required return percentage after inflation
-        - Shows how much growth you need above inflation
-        - Example: If you need 7% growth and inflation is 2%, real return needed is 5%
-        
-    shortfall_pct (float): Gap between what you need and what you expect to get
-        - Positive means you need more return than you expect
-        - Example: If you need 5% but expect 3%, shortfall is 2%
-        
-    draw_ratio (float): How well you can handle market drops
-        - Ratio of typical market drops to what you can tolerate
-        - Example: If markets typically drop 30% but you can only handle 15%,
-                  ratio is 2.0 (suggests high risk)
+    The nine risk capacity inputs from the form, in the order they appear on the page
     
     Returns:
-    tuple: (requirement_score, subscores)
-        - requirement_score (float): Final risk requirement (0-100)
-        - subscores (Dict[str, float]): Individual scores for each factor
+    tuple: (capacity10, rows, sensitivity_rows)
+        - capacity10 (int): Final risk capacity in tenths of a point (0-1000, 826 = 82.6)
+        - rows (list): The capacity breakdown table rows (see build_capacity_breakdown)
+        - sensitivity_rows (list): The sensitivity table rows (see build_sensitivity_rows)
     """
-    # Map RRR (as percent)
-    rrr_pct = rrr * 100.0
-    if rrr_pct <= 2.0:
-        rrr_s = 10.0
-    elif rrr_pct <= 5.0:
-        rrr_s = 35.0
-    elif rrr_pct <= 10.0:
-        rrr_s = 65.0
-    else:
-        rrr_s = 90.0
-
-    # Map Real requirement percent
-    if real_req_pct <= 0.0:
-        real_s = 10.0
-    elif real_req_pct <= 2.0:
-        real_s = 40.0
-    elif real_req_pct <= 5.0:
-        real_s = 70.0
-    else:
-        real_s = 90.0
-
-    # Map shortfall: more shortfall -> higher requirement
-    if shortfall_pct <= 0.0:
-        short_s = 10.0
-    elif shortfall_pct <= 2.0:
-        short_s = 30.0
-    elif shortfall_pct <= 5.0:
-        short_s = 60.0
-    else:
-        short_s = 90.0
-
-    # Map drawdown pressure: higher means riskier to reach goal
-    if draw_ratio <= 0.5:
-        draw_s = 10.0
-    elif draw_ratio <= 1.0:
-        draw_s = 40.0
-    elif draw_ratio <= 2.0:
-        draw_s = 70.0
-    else:
-        draw_s = 90.0
+    # Calculate intermediate financial metrics from user inputs
+
+    # Total yearly expenses, and converted to monthly for emergency fund calculation
+    annual_expenses = annual_fixed + annual_variable
+    monthly_expenses = annual_expenses / 12.0
+
+    # Denominators used below and again for the sensitivity scenarios, worked out once
+    # (at least 1.0, which prevents division by zero)
+    denom_expenses = max(1.0, annual_expenses)
+    denom_withdraw = max(1.0, annual_withdrawals)
+
+    # Calculate Savings Longevity Index (SLI)
+    # This shows how many years your savings would last at current withdrawal rate
+    sli_value = investable_assets / denom_withdraw
+
+    # Calculate Income to Expenses Ratio
+    # This shows how well your income covers your expenses
+    # A ratio > 1 means you have more income than expenses
+    income_ratio = annual_income / denom_expenses
+
+    # Calculate Emergency Fund Coverage in months
+    # This shows how many months your savings could cover expenses
+    months = investable_assets / max(1.0, monthly_expenses)
+
+    # Industry is passed to the compiled scoring core as a small number code
+    industry_code = core_numba.INDUSTRY_CODES.get(industry, -1)
+
+    # Calculate Risk Capacity Scores for each factor in a single compiled call
+    # (core_numba.map_all runs the core_numba.map_* functions, the only implementation
+    # of the capacity subscores). They come back as one array in WEIGHT_KEYS order:
+    # SLI, Income, Expenses, Industry, Age, Growth, Dependents
+    subscores = core_numba.map_all(
+        float(sli_value),           # Savings Longevity: How long savings would last
+        float(income_ratio),        # Income Coverage: How well income covers expenses
+        float(months),              # Emergency Fund: Short-term financial safety net
+        industry_code,              # Industry: Job and income stability
+        int(age),                   # Age: Investment time horizon
+        float(expected_growth),     # Salary Growth: Future earning potential
+        int(dependents),            # Dependents: Financial obligations
+    )
 
-    # Weights: RRR is most important
-    REQ_WEIGHTS = {"RRR": 35.0, "RealReq": 25.0, "Shortfall": 25.0, "DrawPressure": 15.0}
-    subs = {"RRR": rrr_s, "RealReq": real_s, "Shortfall": short_s, "DrawPressure": draw_s}
-    total = sum(REQ_WEIGHTS[k] * subs[k] for k in REQ_WEIGHTS)
-    req_score = round(max(0.0, min(100.0, total / 100.0)), 1)
-    return req_score, subs
+    # Calculate final Risk Capacity Score from the subscores, also compiled
+    # (core_numba.capacity_tenths, which the sensitivity scenarios and the batch
+    # upload use too). It is kept as a whole number of tenths of a point so the
+    # app can compare scores exactly.
+    capacity10 = int(core_numba.capacity_tenths(subscores))
+
+    # Build rows for the capacity breakdown table shown on the results page
+    rows = build_capacity_breakdown(
+        tuple(subscores.tolist()),
+        # The raw value behind each subscore, in the same (WEIGHT_KEYS) order
+        (sli_value, income_ratio, months, industry, age, expected_growth, dependents),
+    )
 
+    # Score the -20% / +20% income and asset scenarios from the same subscores
+    sensitivity_rows = build_sensitivity_rows(
+        subscores, annual_income, investable_assets, denom_expenses, denom_withdraw
+    )
+    return capacity10, rows, sensitivity_rows
 
-# -----------------------
-# Risk Requirement Assessment Functions
-# -----------------------
+# Parts of the capacity breakdown table that are the same for every case, worked out
+# once: where each factor (in table order) sits in WEIGHT_KEYS, the weight labels, and
+# the factors whose input value is shown as plain text instead of a formatted number
+BREAKDOWN_POSITIONS = tuple(WEIGHT_KEYS.index(k) for k in ORDERED_KEYS)
+WEIGHT_LABELS = {k: f"{int(w)}%" for k, w in WEIGHTS.items()}
+TEXT_INPUT_FACTORS = frozenset(("Industry", "Age", "Dependents"))
 
-def map_rrr(rrr: float) -> float:
+def build_capacity_breakdown(subscores: tuple, raw_values: tuple) -> list:
     """
-    Calculates a risk score (0-100) based on Required Rate of Return (RRR).
+    Builds the rows of the risk capacity breakdown table.
     
-    The Required Rate of Return is how much your investments need to grow 
-    each year to reach your financial goal. Higher required returns usually
-    mean you need to take more investment risk.
+    Called from compute_capacity(), so the rows (including the zone explanations)
+    are cached together with the score.
     
     Parameters:
-    rrr (float): Required annual return as decimal (0.07 means 7% per year)
+    subscores (tuple): The seven subscores (0-100) in WEIGHT_KEYS order
+    raw_values (tuple): The input or computed value behind each subscore, in the
+        same order (SLI years, income ratio, months, industry name, age, growth %, dependents)
     
     Returns:
-    float: Risk requirement score (0-100) where:
-    - 0 for required returns <= 3% (very low risk needed)
-    - 25 for required returns around 6% (moderate risk needed)
-    - 60 for required returns around 10% (high risk needed)
-    - 85+ for required returns > 15% (very high risk needed)
-    
-    Example:
-    If you need your money to grow 8% per year:
-    rrr = 0.08 (8%)
-    This would return a moderate-high risk requirement around 45
+    list: One dict per factor, ordered by weight (see ORDERED_KEYS), ready for st.table.
+    Each row contains:
+    - Rank: position by importance
+    - Risk factor: the factor name (SLI, Income, etc.)
+    - Input value: the raw number entered or computed
+    - Subscore: the normalized score for that factor (0-100)
+    - Weight: the percent importance used to compute the final score
+    - Why this matters: a short plain English sentence explaining relevance
     """
-    # Convert decimal to percentage for easier thresholds
-    p = rrr * 100.0
-    
-    if p <= 3.0:  # Very conservative return needed
-        return 0.0
-    if p <= 6.0:  # Conservative to moderate return needed
-        return (p - 3.0) / (6.0 - 3.0) * 25.0
-    if p <= 10.0:  # Moderate to aggressive return needed
-        return 25.0 + (p - 6.0) / (10.0 - 6.0) * 35.0
-    if p <= 15.0:  # Aggressive return needed
-        return 60.0 + (p - 10.0) / (15.0 - 10.0) * 25.0
-    # Very aggressive return needed (capped at 100)
-    return 85.0 + min(p - 15.0, 15.0) / 15.0 * 15.0
-
-def map_realreq(real_pct: float) -> float:
+    rows = []
+    # Walk the factors in table order, picking each one's values by its WEIGHT_KEYS position
+    for key, i in zip(ORDERED_KEYS, BREAKDOWN_POSITIONS):
+        raw_value = raw_values[i]
+        rows.append({
+            "Rank": RANK_MAP[key],
+            "Risk factor": key,
+            # Present input value as formatted number for readability; for categorical values use string
+            "Input value": str(raw_value) if key in TEXT_INPUT_FACTORS else fmt_num(raw_value),
+            "Subscore": fmt_num(subscores[i]),
+            "Weight": WEIGHT_LABELS[key],
+            "Why this matters:": zone_sentence(key, raw_value),
+        })
+    return rows
+
+def build_sensitivity_rows(subscores: np.ndarray, annual_income: float, investable_assets: float,
+                           denom_expenses: float, denom_withdraw: float) -> list:
     """
-    Calculates a risk score (0-100) based on real (inflation-adjusted) required return.
+    Builds the rows of the sensitivity scenarios table.
     
-    Real required return shows how much your investments need to grow above inflation.
-    For example, if you need 7% growth and inflation is 2%, your real required return
-    is 5%. This matters because inflation reduces your purchasing power over time.
+    Called from compute_capacity(), so the rows are cached together with the score.
     
     Parameters:
-    real_pct (float): Required return above inflation, in percentage points
+    subscores (numpy.ndarray): The seven current subscores (0-100) in WEIGHT_KEYS order
+    annual_income, investable_assets, denom_expenses, denom_withdraw (float):
+        As for sensitivity_scores()
     
     Returns:
-    float: Risk requirement score (0-100) where:
-    - 0 for real return <= 0% (no growth needed above inflation)
-    - 25 for real return around 2% (modest growth needed)
-    - 65 for real return around 5% (significant growth needed)
-    - 100 for real return > 15% (very high growth needed)
-    
-    Example:
-    If you need 3% growth above inflation:
-    real_pct = 3.0
-    This would return a moderate risk requirement around 45
-    """
-    if real_pct <= 0.0:  # No real growth needed
-        return 0.0
-    if real_pct <= 2.0:  # Modest real growth needed
-        return (real_pct / 2.0) * 25.0
-    if real_pct <= 5.0:  # Moderate real growth needed
-        return 25.0 + (real_pct - 2.0) / (5.0 - 2.0) * 40.0
-    # Significant real growth needed
-    return 65.0 + min(real_pct - 5.0, 10.0) / 10.0 * 35.0
-
-def map_shortfall(short_pct: float) -> float:
-    """
-    Calculates a risk score (0-100) based on return shortfall.
-    
-    Shortfall is the gap between what return you need and what you expect to get.
-    A positive shortfall means you need to find additional return through taking
-    more risk. The larger the shortfall, the more risk you might need to take.
-    
-    Parameters:
-    short_pct (float): Return shortfall in percentage points
-        = Required return - Expected return
-    
-    Returns:
-    float: Risk requirement score (0-100) where:
-    - 0 for no shortfall (expected return meets or exceeds required)
-    - 50 for 5% shortfall (moderate additional return needed)
-    - 100 for 10% or greater shortfall (significant additional return needed)
-    
-    Example:
-    If you need 8% return but expect 6%:
-    short_pct = 8 - 6 = 2
-    This would return a risk requirement of 20
+    list: Two rows (Income, Investable assets), each with the new risk capacity
+        score for every SENSITIVITY_LABELS column
     """
-    if short_pct <= 0:  # No shortfall
-        return 0.0
-    # Linear mapping: 0-10% shortfall maps to 0-100 score
-    return min(100.0, (short_pct / 10.0) * 100.0)
+    scores = sensitivity_scores(subscores, annual_income, investable_assets,
+                                denom_expenses, denom_withdraw)
+    rows = []
+    for name, row_scores in zip(("Income", "Investable assets"), scores):
+        # One column per change, e.g. {"Change in": "Income", "-20%": "81.5", "+20%": "83.8"}
+        row = {"Change in": name}
+        for label, score in zip(SENSITIVITY_LABELS, row_scores):
+            row[label] = fmt_num(float(score))
+        rows.append(row)
+    return rows
+
+# Requirement factors in table order; this ordering mirrors the internal weights
+# used when computing the requirement
+REQUIREMENT_ORDER = (("RRR", 35), ("RealReq", 25), ("Shortfall", 25), ("DrawPressure", 15))
+
+# Short explanation shown next to each requirement factor in the breakdown table
+REQUIREMENT_WHY = {
+    "RRR": "Required annual growth rate to hit the target in the stated horizon.",
+    "RealReq": "After inflation: how much purchasing-power growth is needed.",
+    "Shortfall": "Difference between required real return and expected return. A positive shortfall means more return must be found via risk.",
+    "DrawPressure": "Historical drawdowns relative to tolerance: higher ratios mean the plan faces more practical risk in downturns."
+}
 
-def map_drawimpact(draw_ratio: float) -> float:
+@st.cache_data(show_spinner=False, max_entries=256)
+def build_requirement_breakdown(rrr: float, real_req_pct: float, shortfall_pct: float, draw_ratio: float):
     """
-    Calculates a risk score (0-100) based on drawdown impact ratio.
-    
-    The drawdown ratio compares typical market drops to what you can tolerate:
-    Ratio = Average market drawdown / Your drawdown tolerance
+    Calculates the risk requirement score and builds the rows of its breakdown table.
     
-    A high ratio means the investment approach you need might have bigger
-    drops than you're comfortable with, indicating higher risk.
+    Streamlit caches the result, so reruns with the same goal inputs reuse the
+    score and rows instead of building them again.
     
     Parameters:
-    draw_ratio (float): Ratio of average drawdown to drawdown tolerance
+    The four requirement metrics, as for compute_risk_requirement()
     
     Returns:
-    float: Risk requirement score (0-100) where:
-    - 0 for ratio <= 0.5 (market drops well within tolerance)
-    - 25 for ratio around 1.0 (drops match tolerance)
-    - 60 for ratio around 1.5 (drops exceed tolerance)
-    - 100 for ratio > 1.5 (drops significantly exceed tolerance)
-    
-    Example:
-    If markets typically drop 30% but you can only tolerate 20%:
-    draw_ratio = 30 / 20 = 1.5
-    This would return a high risk requirement of 60
+    tuple: (requirement10, rows)
+        - requirement10 (int): Final risk requirement in tenths of a point (0-1000)
+        - rows (list): One dict per requirement factor, ready for st.table
     """
-    if draw_ratio <= 0.5:  # Drops well within tolerance
-        return 0.0
-    if draw_ratio <= 1.0:  # Drops approaching tolerance
-        return 25.0
-    if draw_ratio <= 1.5:  # Drops exceeding tolerance
-        return 60.0
-    return 100.0  # Drops far exceeding tolerance
+    requirement10, req_subscores = compute_risk_requirement(rrr, real_req_pct, shortfall_pct, draw_ratio)
+
+    # Create a human readable representation of the raw value that produced each subscore
+    # so the user can see the underlying number and what it refers to.
+    human_val = {
+        "RRR": f"{round(rrr*100,2)}% (RRR)",
+        "RealReq": f"{round(real_req_pct,2)}% (real req)",
+        "Shortfall": f"{round(shortfall_pct,2)}% (shortfall)",
+        "DrawPressure": f"{round(draw_ratio,2)}x (drawdown ratio)"
+    }
+
+    rows_r = []
+    for rank, (k, w) in enumerate(REQUIREMENT_ORDER, start=1):
+        # Build a row that includes a short explanation why this factor matters
+        rows_r.append({
+            "Rank": rank,
+            "Requirement factor": k,
+            "Value": human_val[k],
+            "Subscore": fmt_num(req_subscores[k]),
+            "Weight": f"{w}%",
+            "Why this matters:": REQUIREMENT_WHY[k]
+        })
+    return requirement10, rows_r
 
 # -----------------------
-# Risk Requirement Scoring Weights
+# Page Styling
 # -----------------------
-# These weights determine how important each factor is in calculating how much
-# risk you need to take to reach your financial goals.
-# The weights add up to 100% (100.0).
-
-REQ_WEIGHTS = {
-    # Required Rate of Return: Most important (40%)
-    # Raw growth rate needed to reach your target. Heavily weighted because
-    # it directly shows how ambitious your goal is.
-    "RRR": 40.0,
-    
-    # Real Required Return: Second most important (25%)
-    # Growth needed after inflation. Important because it shows true
-    # purchasing power growth needed.
-    "RealReq": 25.0,
-    
-    # Return Shortfall: Third most important (20%)
-    # Gap between needed and expected returns. Shows how much additional
-    # return you need to find through taking risk.
-    "Shortfall": 20.0,
-    
-    # Drawdown Impact: Fourth most important (15%)
-    # How market drops compare to your tolerance. Less weight but important
-    # for understanding if the required strategy matches your comfort level.
-    "DrawImpact": 15.0,
+# Custom styling that makes the application look professional and easy to read.
+# Defined once here so the same string is reused on every rerun instead of being rebuilt.
+
+CSS_HTML = """
+<style>
+/* Define color variables for consistent theme */
+:root {
+    --accent: #12c755;     /* Bright green for important numbers and buttons */
+    --dark-bg: #071026;    /* Dark blue background for better contrast */
+    --card: #0b1b2b;       /* Slightly lighter blue for cards and sections */
+    --muted: #93a4b6;      /* Muted blue-gray for less important text */
+    --text: #e6eef6;       /* Light blue-white for main text */
+}
+
+/* Set the main background and text colors */
+html, body, .stApp { 
+    background: var(--dark-bg) !important; 
+    color: var(--text) !important; 
+}
+
+/* Style the sidebar to match the main theme */
+.stSidebar { 
+    background: var(--dark-bg) !important; 
+    color: var(--text) !important; 
+}
+
+/* Style cards that display results */
+.rc-card { 
+    background: var(--card); 
+    padding: 14px; 
+    border-radius: 10px; 
+    color: var(--text); 
+}
+
+/* Style the main risk scores to stand out */
+.rc-score { 
+    font-size: 36px; 
+    font-weight: 700; 
+    color: var(--accent); 
+}
+
+/* Style input fields for better visibility */
+input, select, textarea { 
+    background: #0f2a3f !important; 
+    color: var(--text) !important; 
+    border-radius: 6px !important; 
+    border: 1px solid rgba(255,255,255,0.06) !important; 
+    padding: 6px !important; 
+}
+
+/* Style buttons to stand out */
+.stButton>button, .stDownloadButton>button { 
+    background: var(--accent) !important; 
+    color: #031014 !important; 
+    font-weight: 600; 
+    border-radius: 8px !important; 
+    padding: 8px 12px !important; 
+}
+
+/* Limit width of number inputs and dropdowns */
+.stNumberInput, .stSelectbox { 
+    max-width: 360px; 
 }
 
+/* Make data tables more readable */
+.stDataFrame table { 
+    table-layout: auto !important; 
+}
+
+/* Style captions for additional information */
+.stCaption { 
+    color: var(--muted) !important; 
+}
+</style>
+"""
 
 # -----------------------
-# Helper Functions for Formatting and User-Friendly Output
+# Static Page Text
 # -----------------------
+# Long explanations that never change. Each one is rendered with a single st.markdown
+# call instead of one call per line, and is built only once when the app starts.
 
-def fmt_num(x: float) -> str:
+# Methodology: detailed mapping for every risk capacity factor
+METHODOLOGY_CAPACITY_MD = """
+SLI: Savings Longevity Index (investable assets / annual withdrawals):
+
+- <=1 year: subscore = 0: no meaningful cushion.
+- 1 to 5 years: subscore maps linearly from 1 to 40.
+- 5 to 20 years: subscore maps linearly from 40 to 80.
+- >20 years: subscore maps piecewise to 80 to 100.
+
+Income ratio: income / (fixed + variable expenses):
+
+- <=1: subscore = 10: income does not cover expenses.
+- 1 to 1.5: subscore maps 10 to 40: modest coverage.
+- 1.5 to 2.5: subscore maps 40 to 75: comfortable coverage.
+- >2.5: subscore maps up to 100: strong coverage.
+
+Emergency months: investable assets / monthly expenses:
+
+- <=1 month: subscore = 5.
+- 1 to 3 months: subscore maps 20 to 40.
+- 3 to 6 months: subscore maps 40 to 70.
+- >6 months: subscore maps 70 to 100.
+
+Industry stability: categorical mapping (numerical subscores):
+
+- Stable: subscore = 90.
+- Moderate: subscore = 60.
+- Unstable: subscore = 25.
+
+Age mapping:
+
+- <=30 years: subscore = 90.
+- 31 to 40: subscore = 75.
+- 41 to 55: subscore = 50.
+- 56 to 65: subscore = 30.
+- >65: subscore = 10.
+
+Expected salary growth mapping:
+
+- <0%: subscore = 10.
+- 0 to 2%: subscore = 30.
+- 2 to 5%: subscore = 60.
+- >5%: subscore = 85.
+
+Dependents mapping:
+
+- 0: subscore = 90.
+- 1: subscore = 70.
+- 2: subscore = 50.
+- 3: subscore = 30.
+- 4+: subscore = 15.
+
+Weighting summary: SLI (25%) and Income (20%) are the heaviest because liquidity and income determine forced selling risk. Expenses (15%), Industry (12%), Age (12%), Growth (8%), Dependents (8%).
+"""
+
+# Methodology: formulas behind the risk requirement score
+METHODOLOGY_REQUIREMENT_MD = """
+RRR: Required rate of return (compound annual growth rate):
+
+- Formula: RRR = (Target / Current)^(1 / horizon) - 1.
+- RRR tells us how fast capital needs to grow to meet the stated goal in the given time horizon.
+
+Real return requirement:
+
+- Real requirement = RRR - inflation (both in percentage terms).
+- This adjusts required nominal growth for expected loss of purchasing power.
+
+Shortfall:
+
+- Shortfall = Real requirement - Expected return.
+- A positive shortfall means the expected return is insufficient and additional risk must be taken.
+
+Drawdown pressure:
+
+- Drawdown pressure = average historical drawdown / drawdown tolerance.
+- If historical drawdowns exceed tolerance, the path to the target is riskier in practice.
+
+Requirement scoring:
+
+- We map these four dimensions into normalized subscores, then combine with weights: RRR 35%, RealReq 25%, Shortfall 25%, DrawPressure 15%.
+"""
+
+# Legal disclaimer shown below the results
+DISCLAIMER_MD = "This tool provides educational information only and is not financial or investment advice. Consult a licensed financial professional before acting on outputs. We accept no liability for investment decisions made based on this tool."
+
+# Introduction shown under the page title
+INTRO_MD = """
+This tool helps determine:
+1. How much investment risk you can afford to take (Risk Capacity)
+2. How much risk you need to take to reach your goals (Risk Requirement)
+
+The tool will give you scores from 0 to 100, where:
+- 0-25: Conservative (low risk)
+- 26-50: Moderate-Conservative
+- 51-75: Moderate-Aggressive
+- 76-100: Aggressive (high risk)
+
+Fill in your financial information below and click Calculate to see your results.
+"""
+
+# Reminder shown next to the auto-update option
+ACCURACY_CAPTION = """
+Please provide accurate numbers for the best results.
+If you're unsure about exact values, use your best estimate.
+Missing or inaccurate values will make the results less reliable.
+"""
+
+# Explanation shown above the goal inputs
+GOAL_CAPTION = """
+This section helps determine how much investment risk you need to take
+to reach your financial goals. Be realistic with your targets and timeframe.
+"""
+
+# Result card for the Risk Requirement score; {score} is replaced by the formatted score
+REQUIREMENT_CARD_HTML = """
+<div class='rc-card'>
+    <div style='font-size:20px; color:var(--muted)'>
+        Risk Requirement Score: How much risk you need to take
+        <p style='font-size:14px; margin-top:5px'>
+        This score shows how aggressive your investments need to be to reach your goals:
+        - 0-25: Conservative strategy may be enough
+        - 26-50: Moderate strategy needed
+        - 51-75: Moderately aggressive strategy needed
+        - 76-100: Very aggressive strategy needed
+        </p>
+    </div>
+    <div class='rc-score'>{score} / 100</div>
+</div>
+"""
+
+# Result card for the Risk Capacity score; {score} is replaced by the formatted score
+CAPACITY_CARD_HTML = """
+<div style='margin-top:10px' class='rc-card'>
+    <div style='font-size:20px; color:var(--muted)'>
+        Risk Capacity Score: How much risk you can afford
+        <p style='font-size:14px; margin-top:5px'>
+        This score shows your financial ability to handle investment risk:
+        - 0-25: Limited capacity (be conservative)
+        - 26-50: Moderate capacity (some risk ok)
+        - 51-75: Good capacity (can take more risk)
+        - 76-100: Strong capacity (can be aggressive)
+        </p>
+    </div>
+    <div class='rc-score'>{score} / 100</div>
+</div>
+"""
+
+# Plain-language summary of the requirement level (High >= 70, Moderate >= 45, otherwise Low)
+REQ_MSG_HIGH = "Requirement: High: achieving the target within the time horizon requires an aggressive return profile."
+REQ_MSG_MODERATE = "Requirement: Moderate: achieving the target requires above-average returns."
+REQ_MSG_LOW = "Requirement: Low: the target is achievable with a conservative-to-moderate approach."
+
+# Requirement score thresholds and the message for each level, lowest first:
+# below 45 -> Low, 45 up to 70 -> Moderate, 70 and above -> High
+REQ_MSG_THRESHOLDS = (45, 70)
+# The same thresholds in tenths of a point, for comparing with requirement10
+REQ_MSG_THRESHOLDS_10 = tuple(10 * t for t in REQ_MSG_THRESHOLDS)
+REQ_MSGS = (REQ_MSG_LOW, REQ_MSG_MODERATE, REQ_MSG_HIGH)
+
+# Capacity vs requirement comparison; {diff} is replaced by the formatted point difference
+ALIGN_MSG_ABOVE = "Capacity exceeds requirement by {diff} points: you have room to pursue a more aggressive plan while keeping resilience."
+ALIGN_MSG_MATCH = "Capacity roughly matches requirement (difference {diff}): proceed with a monitored plan and periodic reviews."
+ALIGN_MSG_BELOW = "Capacity is {diff} points below requirement: this is a material mismatch. Options: increase savings, extend the time horizon, or reduce the target."
+
+# Capacity minus requirement thresholds (in tenths of a point) and the message and
+# Streamlit message box for each outcome, lowest first: more than 10 points below ->
+# warning, from 10 below up to 10 above -> info, 10 or more above -> success
+ALIGN_THRESHOLDS_10 = (-100, 100)
+ALIGN_MSGS = (ALIGN_MSG_BELOW, ALIGN_MSG_MATCH, ALIGN_MSG_ABOVE)
+ALIGN_BOXES = (st.warning, st.info, st.success)
+
+# Purpose statement shown at the bottom of the results, below a divider line
+FOOTER_MD = "---\n\nPurpose: Produce an objective, explainable estimate of a client's financial risk capacity and the minimum risk required to reach their stated goals. Use with behavioral preference and professional judgment."
+
+# Hint shown before anything has been calculated
+CALCULATE_HINT = "Press Calculate to compute scores. If you want instant updates while editing, enable 'Auto-update' above."
+
+# Shown under the batch upload box until a file is uploaded
+BATCH_CAPTION = "Upload a CSV with one client per line to score many clients at once. Required columns: " + ", ".join(BATCH_COLUMNS) + " (industry is Stable, Moderate or Unstable)."
+
+# -----------------------
+# Page Sections
+# -----------------------
+
+def methodology_panel():
     """
-    Formats numbers to be more readable by removing unnecessary decimals.
-    
-    This function makes numbers look cleaner by:
-    1. Converting whole numbers to integers (e.g., 5.0 becomes 5)
-    2. Keeping one decimal place for non-whole numbers
-    3. Removing trailing zeros after decimal points
+    Shows the two long methodology expanders (capacity and requirement).
     
-    Parameters:
-    x (float): The number to format
-    
-    Returns:
-    str: A cleanly formatted string representation of the number
-    
-    Examples:
-    fmt_num(5.0) -> "5"
-    fmt_num(5.5) -> "5.5"
-    fmt_num(5.50) -> "5.5"
+    The text never changes, so it comes straight from the module-level constants.
+    It is still written on every run on purpose: Streamlit removes any element
+    that a rerun does not write again, so caching this call with st.cache_resource
+    (or skipping it after the first run) would make the expanders disappear.
     """
-    if abs(x - round(x)) < 1e-9:  # If x is effectively a whole number
-        return str(int(round(x)))
-    # For non-whole numbers, round to 1 decimal and remove unnecessary zeros
-    return f"{round(x,1):.1f}".rstrip('0').rstrip('.')
+    with st.expander("Methodology: Capacity — Long (detailed ranges and numeric mappings)"):
+        st.markdown(METHODOLOGY_CAPACITY_MD)
 
-def zone_sentence(component: str, raw_value: float) -> str:
+    with st.expander("Methodology: Requirement — Long (detailed explanation and formula)"):
+        st.markdown(METHODOLOGY_REQUIREMENT_MD)
+
+
+def sensitivity_panel(sensitivity_rows: list):
     """
-    Creates a human-readable explanation of what different financial metrics mean.
+    Shows the sensitivity scenarios (income and assets -20% / +20%) as a small table.
     
-    This function takes a financial metric (like savings longevity or income ratio)
-    and translates its numerical value into plain English that explains:
-    1. What the number means
-    2. Which category or zone the number falls into
-    3. Why this number matters for financial planning
+    All four scenario scores are calculated together, so the user sees every outcome
+    at once without clicking anything (and without extra reruns). The rows come
+    from compute_capacity(), so they are cached together with the score.
     
     Parameters:
-    component (str): The type of financial metric (SLI, Income, etc.)
-    raw_value (float): The actual numerical value of the metric
-    
-    Returns:
-    str: A complete sentence explaining the metric's value and significance
+    sensitivity_rows (list): The table rows built by build_sensitivity_rows()
     """
-    # Savings Longevity Index (SLI) interpretation
-    if component == "SLI":
-        # Determine which zone the SLI falls into and explain its meaning
-        if raw_value <= 1:
-            zone = "No meaningful liquid cushion (<=1 year)."
-        elif raw_value <= 5:
-            zone = "Low cushion (1-5 years)."
-        elif raw_value <= 20:
-            zone = "Moderate cushion (5-20 years)."
-        else:
-            zone = "Very strong cushion (>20 years)."
-        # Return complete explanation with the actual value and its implications
-        return f"SLI = {fmt_num(raw_value)} years - {zone} Larger SLI => stronger resilience to withdrawals and shocks."
-    # Income to Expenses Ratio interpretation
-    if component == "Income":
-        r = raw_value  # r represents the ratio of income to expenses
-        if r <= 1:
-            z = "Income <= expenses (high forced selling risk)."  # Income doesn't cover expenses
-        elif r <= 1.5:
-            z = "Income modestly above expenses."  # Small positive cash flow
-        elif r <= 2.5:
-            z = "Income comfortably above expenses."  # Good positive cash flow
-        else:
-            z = "High income vs expenses (strong buffer)."  # Very strong positive cash flow
-        return f"Income ratio = {round(r,2)} - {z}"
-    
-    # Emergency Fund Coverage interpretation
-    if component == "Expenses":
-        m = raw_value  # m represents months of expenses covered by savings
-        if m <= 1:
-            z = "Under 1 month emergency cushion."  # Very limited safety net
-        elif m <= 3:
-            z = "1-3 months."  # Basic safety net
-        elif m <= 6:
-            z = "3-6 months."  # Standard safety net
-        else:
-            z = "6+ months."  # Strong safety net
-        return f"Emergency months = {fmt_num(m)} - {z}"
-    
-    # Industry Stability interpretation
-    if component == "Industry":
-        # Explains how stable employment in their industry typically is
-        return f"Industry stability = {raw_value}. Stable industries imply reduced income disruption risk."
-    
-    # Age Factor interpretation
-    if component == "Age":
-        # Explains how age affects ability to recover from financial setbacks
-        return f"Age = {int(raw_value)}. Younger investors have longer recovery horizons (higher capacity)."
-    
-    # Expected Salary Growth interpretation
-    if component == "Growth":
-        # Explains how future salary increases affect financial flexibility
-        return f"Expected salary growth = {fmt_num(raw_value)}% p.a. Higher growth increases future capacity."
-    
-    # Number of Dependents interpretation
-    if component == "Dependents":
-        # Explains how financial obligations affect risk capacity
-        return f"Dependents = {int(raw_value)}. More dependents reduce discretionary capacity."
+    with st.expander("Sensitivity scenarios: quick shocks to see how score moves"):
+        st.markdown("These scenarios show how the final risk capacity score moves if key cushions shift by realistic amounts.")
+        st.table(sensitivity_rows, hide_index=True)
+
+
+def batch_panel():
+    """
+    Lets the user upload a CSV with many clients and shows each client's risk capacity score.
     
-    # Default return if component type is not recognized
-    return ""
+    The file needs one line per client and the columns listed in BATCH_COLUMNS
+    (the same names as in the downloadable results CSV).
+    """
+    st.markdown("### Batch scoring")
+    uploaded = st.file_uploader("Batch CSV", type="csv")
+    if uploaded is None:
+        st.caption(BATCH_CAPTION)
+        return
+    try:
+        rows = score_uploaded_csv(uploaded.getvalue())
+    except ValueError as err:
+        st.error(str(err))
+        return
+    st.dataframe(rows, hide_index=True)
 
 # -----------------------
 # User Interface and Visual Design
@@ -716,106 +908,19 @@ def main():
     # Configure the page with a wide layout for better use of screen space
     st.set_page_config(page_title="Risk Capacity Estimator", layout="wide")
     # Apply custom styling to make the application look professional and easy to read
-    st.markdown(
-        """
-        <style>
-        /* Define color variables for consistent theme */
-        :root {
-            --accent: #12c755;     /* Bright green for important numbers and buttons */
-            --dark-bg: #071026;    /* Dark blue background for better contrast */
-            --card: #0b1b2b;       /* Slightly lighter blue for cards and sections */
-            --muted: #93a4b6;      /* Muted blue-gray for less important text */
-            --text: #e6eef6;       /* Light blue-white for main text */
-        }
-        
-        /* Set the main background and text colors */
-        html, body, .stApp { 
-            background: var(--dark-bg) !important; 
-            color: var(--text) !important; 
-        }
-        
-        /* Style the sidebar to match the main theme */
-        .stSidebar { 
-            background: var(--dark-bg) !important; 
-            color: var(--text) !important; 
-        }
-        
-        /* Style cards that display results */
-        .rc-card { 
-            background: var(--card); 
-            padding: 14px; 
-            border-radius: 10px; 
-            color: var(--text); 
-        }
-        
-        /* Style the main risk scores to stand out */
-        .rc-score { 
-            font-size: 36px; 
-            font-weight: 700; 
-            color: var(--accent); 
-        }
-        
-        /* Style input fields for better visibility */
-        input, select, textarea { 
-            background: #0f2a3f !important; 
-            color: var(--text) !important; 
-            border-radius: 6px !important; 
-            border: 1px solid rgba(255,255,255,0.06) !important; 
-            padding: 6px !important; 
-        }
-        
-        /* Style buttons to stand out */
-        .stButton>button, .stDownloadButton>button { 
-            background: var(--accent) !important; 
-            color: #031014 !important; 
-            font-weight: 600; 
-            border-radius: 8px !important; 
-            padding: 8px 12px !important; 
-        }
-        
-        /* Limit width of number inputs and dropdowns */
-        .stNumberInput, .stSelectbox { 
-            max-width: 360px; 
-        }
-        
-        /* Make data tables more readable */
-        .stDataFrame table { 
-            table-layout: auto !important; 
-        }
-        
-        /* Style captions for additional information */
-        .stCaption { 
-            color: var(--muted) !important; 
-        }
-        </style>
-        """, unsafe_allow_html=True
-    )
+    # (Streamlit removes any element that is not written again on a rerun, so the
+    # stylesheet has to be emitted every time; only the string itself is reused.)
+    st.markdown(CSS_HTML, unsafe_allow_html=True)
 
     # Display the main title and introduction
     st.title("Risk Capacity Estimator")
-    st.write("""
-    This tool helps determine:
-    1. How much investment risk you can afford to take (Risk Capacity)
-    2. How much risk you need to take to reach your goals (Risk Requirement)
-    
-    The tool will give you scores from 0 to 100, where:
-    - 0-25: Conservative (low risk)
-    - 26-50: Moderate-Conservative
-    - 51-75: Moderate-Aggressive
-    - 76-100: Aggressive (high risk)
-    
-    Fill in your financial information below and click Calculate to see your results.
-    """)
+    st.markdown(INTRO_MD)
 
     # Create a two-column layout for the top controls
     c1, c2 = st.columns([1, 0.6])
     with c1:
         # Remind users to provide accurate information
-        st.caption("""
-        Please provide accurate numbers for the best results.
-        If you're unsure about exact values, use your best estimate.
-        Missing or inaccurate values will make the results less reliable.
-        """)
+        st.caption(ACCURACY_CAPTION)
     with c2:
         # Option to automatically update results while changing inputs
         auto_update = st.checkbox(
@@ -882,7 +987,7 @@ def main():
             # Career and income growth potential
             industry = st.radio(
                 "Industry stability:",
-                ["Stable", "Moderate", "Unstable"],
+                INDUSTRY_OPTIONS,
                 index=1,
                 help="""
                 How stable is employment in your industry?
@@ -925,10 +1030,7 @@ def main():
             
             # Financial goals and planning section
             st.markdown("### Goal inputs (for Risk Requirement)")
-            st.caption("""
-            This section helps determine how much investment risk you need to take
-            to reach your financial goals. Be realistic with your targets and timeframe.
-            """)
+            st.caption(GOAL_CAPTION)
             
             target_wealth = st.number_input(
                 "Target portfolio value (USD):",
@@ -1000,57 +1102,28 @@ def main():
                 """
             )
 
+        # The form only reruns the page when this button is pressed, so typing into
+        # the fields above does not recalculate anything until the user submits
         submitted = st.form_submit_button("Calculate")
         if auto_update:
             # emulate immediate submit when auto-update is on
             submitted = True
 
+    # Widgets inside a form keep returning their last submitted values, so results
+    # that were calculated once stay valid on later reruns (e.g. after turning
+    # auto-update off) and keep being shown instead of disappearing.
     if submitted:
-        # Calculate intermediate financial metrics from user inputs
-        
-        # Convert annual expenses to monthly for emergency fund calculation
-        monthly_expenses = (annual_fixed + annual_variable) / 12.0
-        
-        # Calculate Savings Longevity Index (SLI)
-        # This shows how many years your savings would last at current withdrawal rate
-        # Using max(1.0, annual_withdrawals) prevents division by zero
-        sli_value = investable_assets / max(1.0, annual_withdrawals)
-        
-        # Calculate Income to Expenses Ratio
-        # This shows how well your income covers your expenses
-        # A ratio > 1 means you have more income than expenses
-        income_ratio = annual_income / max(1.0, (annual_fixed + annual_variable))
-        
-        # Calculate Emergency Fund Coverage in months
-        # This shows how many months your savings could cover expenses
-        months = investable_assets / max(1.0, monthly_expenses)
-
-        # Calculate Risk Capacity Scores for each factor
-        subscores = {
-            # Savings Longevity: How long savings would last
-            "SLI": map_sli(sli_value),
-            
-            # Income Coverage: How well income covers expenses
-            "Income": map_income_ratio(income_ratio),
-            
-            # Emergency Fund: Short-term financial safety net
-            "Expenses": map_emergency_months(months),
-            
-            # Industry: Job and income stability
-            "Industry": map_industry(industry),
-            
-            # Age: Investment time horizon
-            "Age": map_age(int(age)),
-            
-            # Salary Growth: Future earning potential
-            "Growth": map_growth(float(expected_growth)),
-            
-            # Dependents: Financial obligations
-            "Dependents": map_dependents(int(dependents)),
-        }
-        
-        # Calculate final Risk Capacity Score (0-100)
-        capacity_score = compute_risk_capacity(subscores)
+        st.session_state["_has_results"] = True
+
+    if st.session_state.get("_has_results", False):
+        # Calculate the Risk Capacity Score, its breakdown table and the sensitivity
+        # scenarios. compute_capacity is cached by Streamlit, so inputs that were
+        # already calculated (e.g. when only the goal and market inputs changed, or
+        # a change was undone) reuse the earlier results instead of recalculating.
+        capacity10, rows, sensitivity_rows = compute_capacity(
+            age, dependents, annual_income, annual_fixed, annual_variable,
+            industry, expected_growth, investable_assets, annual_withdrawals,
+        )
 
         # Calculate Risk Requirement Score
         # This shows how much investment risk you need to take to reach your goals
@@ -1081,9 +1154,11 @@ def main():
         # Example: If markets drop 30% but you can only handle 15%, ratio is 2.0
         draw_ratio = float(avg_drawdown) / max(float(drawdown_tolerance), 0.0001)
         
-        # Calculate final Risk Requirement Score (0-100)
+        # Calculate final Risk Requirement Score (0-100) and the rows of its breakdown table
         # Higher scores mean you need to take more investment risk
-        requirement_score, req_subscores = compute_risk_requirement(
+        # (cached, so unchanged goal inputs reuse the previous score and rows)
+        # Both scores are whole numbers of tenths of a point (e.g. 795 means 79.5)
+        requirement10, rows_r = build_requirement_breakdown(
             rrr,              # Required growth rate
             real_req_pct,     # Growth needed above inflation
             shortfall_pct,    # Extra return needed
@@ -1094,45 +1169,12 @@ def main():
         st.markdown("---")
         st.header("Results")
         
-        # Display Risk Requirement Score
-        # This shows how much investment risk you need to take to reach your goals
+        # Display both score cards with a single st.markdown call:
+        # - Risk Requirement Score: how much investment risk you need to take to reach your goals
+        # - Risk Capacity Score: how much investment risk you can afford to take
         st.markdown(
-            f"""
-            <div class='rc-card'>
-                <div style='font-size:20px; color:var(--muted)'>
-                    Risk Requirement Score: How much risk you need to take
-                    <p style='font-size:14px; margin-top:5px'>
-                    This score shows how aggressive your investments need to be to reach your goals:
-                    - 0-25: Conservative strategy may be enough
-                    - 26-50: Moderate strategy needed
-                    - 51-75: Moderately aggressive strategy needed
-                    - 76-100: Very aggressive strategy needed
-                    </p>
-                </div>
-                <div class='rc-score'>{fmt_num(requirement_score)} / 100</div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
-
-        # Display Risk Capacity Score
-        # This shows how much investment risk you can afford to take
-        st.markdown(
-            f"""
-            <div style='margin-top:10px' class='rc-card'>
-                <div style='font-size:20px; color:var(--muted)'>
-                    Risk Capacity Score: How much risk you can afford
-                    <p style='font-size:14px; margin-top:5px'>
-                    This score shows your financial ability to handle investment risk:
-                    - 0-25: Limited capacity (be conservative)
-                    - 26-50: Moderate capacity (some risk ok)
-                    - 51-75: Good capacity (can take more risk)
-                    - 76-100: Strong capacity (can be aggressive)
-                    </p>
-                </div>
-                <div class='rc-score'>{fmt_num(capacity_score)} / 100</div>
-            </div>
-            """, 
+            REQUIREMENT_CARD_HTML.format(score=fmt_score10(requirement10))
+            + CAPACITY_CARD_HTML.format(score=fmt_score10(capacity10)),
             unsafe_allow_html=True
         )
 
@@ -1148,78 +1190,41 @@ def main():
         # - High: the plan needs aggressive returns to succeed
         # - Moderate: above average returns are needed
         # - Low: conservative or moderate investing is sufficient
-        if requirement_score >= 70:
-            # Very high requirement: client needs strong returns to meet goal
-            req_msg = "Requirement: High: achieving the target within the time horizon requires an aggressive return profile."
-        elif requirement_score >= 45:
-            # Middle zone: some extra return is needed
-            req_msg = "Requirement: Moderate: achieving the target requires above-average returns."
-        else:
-            # Low requirement: the target is reasonable for conservative approaches
-            req_msg = "Requirement: Low: the target is achievable with a conservative-to-moderate approach."
+        # bisect_right puts a score equal to a threshold in the higher level (e.g. 70 -> High)
+        req_msg = REQ_MSGS[bisect_right(REQ_MSG_THRESHOLDS_10, requirement10)]
 
         # Show the requirement message to the user in an info box so it stands out
         st.markdown("### Interpretation and alignment")
         st.info(req_msg)
 
         # Compare capacity and requirement so the user can see alignment
-        # diff = capacity_score - requirement_score
+        # diff10 = capacity10 - requirement10 (in tenths of a point, so 100 = 10 points)
         # Positive diff: user can take more risk than required
         # Near zero diff: capacity and requirement are roughly aligned
         # Negative diff: capacity is below requirement and action is needed
-        diff = round(capacity_score - requirement_score, 1)
+        diff10 = capacity10 - requirement10
 
         # Choose plain language messages for the three outcomes and use the
         # appropriate Streamlit message style so the user immediately sees
         # whether the situation is good (success), neutral (info) or worrying (warning).
-        if diff >= 10:
-            # Capacity meaningfully exceeds requirement
-            align_msg = f"Capacity exceeds requirement by {fmt_num(diff)} points: you have room to pursue a more aggressive plan while keeping resilience."
-            st.success(align_msg)
-        elif -10 <= diff < 10:
-            # Capacity roughly matches requirement
-            align_msg = f"Capacity roughly matches requirement (difference {fmt_num(diff)}): proceed with a monitored plan and periodic reviews."
-            st.info(align_msg)
-        else:
-            # Capacity is meaningfully below requirement, suggest options
-            align_msg = f"Capacity is {fmt_num(-diff)} points below requirement: this is a material mismatch. Options: increase savings, extend the time horizon, or reduce the target."
-            st.warning(align_msg)
+        # bisect_right puts a difference equal to a threshold in the higher outcome
+        # (e.g. exactly 10 points above -> success, exactly 10 below -> info)
+        outcome = bisect_right(ALIGN_THRESHOLDS_10, diff10)
+        # The "below" message states the gap as a positive number of points
+        shown_diff10 = -diff10 if outcome == 0 else diff10
+        align_msg = ALIGN_MSGS[outcome].format(diff=fmt_score10(shown_diff10))
+        ALIGN_BOXES[outcome](align_msg)
 
         # -----------------------
         # Capacity breakdown: explain each factor and how it contributed
         # The table is ordered by the importance (weight) of each factor so the
-        # user sees the most important items first.
+        # user sees the most important items first (see ORDERED_KEYS).
         # -----------------------
         st.markdown("### Risk Capacity: case-specific breakdown (ranked by weight)")
 
-        # Sort the WEIGHTS dictionary by value descending to get the ranking
-        sorted_weights = sorted(WEIGHTS.items(), key=lambda kv: -kv[1])
-        ordered_keys = [k for k, _ in sorted_weights]
-
-        # Build rows for a readable table. Each row contains:
-        # - Rank: position by importance
-        # - Risk factor: the factor name (SLI, Income, etc.)
-        # - Input value: the raw number entered or computed
-        # - Subscore: the normalized score for that factor (0-100)
-        # - Weight: the percent importance used to compute the final score
-        # - Why this matters: a short plain English sentence explaining relevance
-        rows = []
-        for rank, key in enumerate(ordered_keys, start=1):
-            # Look up the raw input or computed value for each factor
-            raw_val = {"SLI": sli_value, "Income": income_ratio, "Expenses": months, "Industry": industry, "Age": age, "Growth": expected_growth, "Dependents": dependents}[key]
-            rows.append({
-                "Rank": rank,
-                "Risk factor": key,
-                # Present input value as formatted number for readability; for categorical values use string
-                "Input value": fmt_num(raw_val) if key not in ["Industry", "Age", "Dependents"] else str(raw_val),
-                "Subscore": fmt_num(subscores[key]),
-                "Weight": f"{int(WEIGHTS[key])}%",
-                "Why this matters:": zone_sentence(key, raw_val)
-            })
-
-        # Convert rows to a DataFrame for a tidy display and show it to the user
-        df_cap = pd.DataFrame(rows)
-        st.dataframe(df_cap, width=960, height=240)
+        # Show the rows built together with the capacity score as a simple static
+        # table (no interactive data grid needed for 7 rows)
+        st.table(rows, hide_index=True)
 
         # -----------------------
         # Requirement breakdown: show the components that drive the requirement score
@@ -1228,155 +1233,43 @@ def main():
         # -----------------------
         st.markdown("### Risk Requirement: case-specific breakdown (ranked by weight)")
 
-        # This ordering mirrors the internal weights used when computing the requirement
-        req_order = [("RRR", 35), ("RealReq", 25), ("Shortfall", 25), ("DrawPressure", 15)]
-        rows_r = []
-        for rank, (k, w) in enumerate(req_order, start=1):
-            # Get the numeric subscore we computed earlier for display
-            val = req_subscores[k]
-
-            # Create a human readable representation of the raw value that produced the subscore
-            # so the user can see the underlying number and what it refers to.
-            human_val = {
-                "RRR": f"{round(rrr*100,2)}% (RRR)",
-                "RealReq": f"{round(real_req_pct,2)}% (real req)",
-                "Shortfall": f"{round(shortfall_pct,2)}% (shortfall)",
-                "DrawPressure": f"{round(draw_ratio,2)}x (drawdown ratio)"
-            }[k]
-
-            # Build a row that includes a short explanation why this factor matters
-            rows_r.append({
-                "Rank": rank,
-                "Requirement factor": k,
-                "Value": human_val,
-                "Subscore": fmt_num(val),
-                "Weight": f"{w}%",
-                "Why this matters:": {
-                    "RRR": "Required annual growth rate to hit the target in the stated horizon.",
-                    "RealReq": "After inflation: how much purchasing-power growth is needed.",
-                    "Shortfall": "Difference between required real return and expected return. A positive shortfall means more return must be found via risk.",
-                    "DrawPressure": "Historical drawdowns relative to tolerance: higher ratios mean the plan faces more practical risk in downturns."
-                }[k]
-            })
-
-        # Convert to DataFrame and show the table
-        df_req = pd.DataFrame(rows_r)
-        st.dataframe(df_req, width=960, height=180)
+        # Show the rows (built by build_requirement_breakdown above) as a simple static table
+        st.table(rows_r, hide_index=True)
 
         # -----------------------
         # Sensitivity scenarios: quick what if examples
         # These let the user see how a few realistic changes affect the risk capacity.
         # They are short interactive examples rather than a full sensitivity analysis.
         # -----------------------
-        with st.expander("Sensitivity scenarios: quick shocks to see how score moves"):
-            st.write("These scenarios show how the final risk capacity score moves if key cushions shift by realistic amounts.")
-            colA, colB = st.columns(2)
-            with colA:
-                # Income -20%: simulates losing some income or having lower pay
-                if st.button("Income -20%"):
-                    new_income_ratio = (annual_income * 0.8) / max(1.0, (annual_fixed + annual_variable))
-                    # Copy the existing subscores and replace only the Income subscore
-                    subs2 = subscores.copy(); subs2["Income"] = map_income_ratio(new_income_ratio)
-                    st.write("New risk capacity:", fmt_num(compute_risk_capacity(subs2)))
-
-                # Income +20%: simulates a pay raise or bonus
-                if st.button("Income +20%"):
-                    new_income_ratio = (annual_income * 1.2) / max(1.0, (annual_fixed + annual_variable))
-                    subs2 = subscores.copy(); subs2["Income"] = map_income_ratio(new_income_ratio)
-                    st.write("New risk capacity:", fmt_num(compute_risk_capacity(subs2)))
-            with colB:
-                # Assets -20%: simulates a loss in investable assets or using savings
-                if st.button("Assets -20%"):
-                    sli2 = (investable_assets * 0.8) / max(1.0, annual_withdrawals)
-                    subs2 = subscores.copy(); subs2["SLI"] = map_sli(sli2)
-                    st.write("New risk capacity:", fmt_num(compute_risk_capacity(subs2)))
-
-                # Assets +20%: simulates saving more or portfolio gains
-                if st.button("Assets +20%"):
-                    sli2 = (investable_assets * 1.2) / max(1.0, annual_withdrawals)
-                    subs2 = subscores.copy(); subs2["SLI"] = map_sli(sli2)
-                    st.write("New risk capacity:", fmt_num(compute_risk_capacity(subs2)))
+        # All four scenarios are scored together and shown as one table (no buttons, no extra reruns)
+        sensitivity_panel(sensitivity_rows)
 
         # -----------------------
         # Methodology: Detailed mapping for every factor (no references to proprietary code)
         # -----------------------
-        with st.expander("Methodology: Capacity — Long (detailed ranges and numeric mappings)"):
-            st.markdown("SLI: Savings Longevity Index (investable assets / annual withdrawals):")
-            st.write(" - <=1 year: subscore = 0: no meaningful cushion.")
-            st.write(" - 1 to 5 years: subscore maps linearly from 1 to 40.")
-            st.write(" - 5 to 20 years: subscore maps linearly from 40 to 80.")
-            st.write(" - >20 years: subscore maps piecewise to 80 to 100.")
-            st.markdown("Income ratio: income / (fixed + variable expenses):")
-            st.write(" - <=1: subscore = 10: income does not cover expenses.")
-            st.write(" - 1 to 1.5: subscore maps 10 to 40: modest coverage.")
-            st.write(" - 1.5 to 2.5: subscore maps 40 to 75: comfortable coverage.")
-            st.write(" - >2.5: subscore maps up to 100: strong coverage.")
-            st.markdown("Emergency months: investable assets / monthly expenses:")
-            st.write(" - <=1 month: subscore = 5.")
-            st.write(" - 1 to 3 months: subscore maps 20 to 40.")
-            st.write(" - 3 to 6 months: subscore maps 40 to 70.")
-            st.write(" - >6 months: subscore maps 70 to 100.")
-            st.markdown("Industry stability: categorical mapping (numerical subscores):")
-            st.write(" - Stable: subscore = 90.")
-            st.write(" - Moderate: subscore = 60.")
-            st.write(" - Unstable: subscore = 25.")
-            st.markdown("Age mapping:")
-            st.write(" - <=30 years: subscore = 90.")
-            st.write(" - 31 to 40: subscore = 75.")
-            st.write(" - 41 to 55: subscore = 50.")
-            st.write(" - 56 to 65: subscore = 30.")
-            st.write(" - >65: subscore = 10.")
-            st.markdown("Expected salary growth mapping:")
-            st.write(" - <0%: subscore = 10.")
-            st.write(" - 0 to 2%: subscore = 30.")
-            st.write(" - 2 to 5%: subscore = 60.")
-            st.write(" - >5%: subscore = 85.")
-            st.markdown("Dependents mapping:")
-            st.write(" - 0: subscore = 90.")
-            st.write(" - 1: subscore = 70.")
-            st.write(" - 2: subscore = 50.")
-            st.write(" - 3: subscore = 30.")
-            st.write(" - 4+: subscore = 15.")
-            st.markdown("Weighting summary: SLI (25%) and Income (20%) are the heaviest because liquidity and income determine forced selling risk. Expenses (15%), Industry (12%), Age (12%), Growth (8%), Dependents (8%).")
-
-        with st.expander("Methodology: Requirement — Long (detailed explanation and formula)"):
-            st.markdown("RRR: Required rate of return (compound annual growth rate):")
-            st.write(" - Formula: RRR = (Target / Current)^(1 / horizon) - 1.")
-            st.write(" - RRR tells us how fast capital needs to grow to meet the stated goal in the given time horizon.")
-            st.markdown("Real return requirement:")
-            st.write(" - Real requirement = RRR - inflation (both in percentage terms).")
-            st.write(" - This adjusts required nominal growth for expected loss of purchasing power.")
-            st.markdown("Shortfall:")
-            st.write(" - Shortfall = Real requirement - Expected return.")
-            st.write(" - A positive shortfall means the expected return is insufficient and additional risk must be taken.")
-            st.markdown("Drawdown pressure:")
-            st.write(" - Drawdown pressure = average historical drawdown / drawdown tolerance.")
-            st.write(" - If historical drawdowns exceed tolerance, the path to the target is riskier in practice.")
-            st.markdown("Requirement scoring:")
-            st.write(" - We map these four dimensions into normalized subscores, then combine with weights: RRR 35%, RealReq 25%, Shortfall 25%, DrawPressure 15%.")
+        methodology_panel()
 
         # CSV download and disclaimer
-        df_out = pd.DataFrame([{
-            "age": age, "dependents": dependents, "annual_income": annual_income,
-            "annual_fixed": annual_fixed, "annual_variable": annual_variable,
-            "industry": industry, "expected_growth": expected_growth,
-            "investable_assets": investable_assets, "annual_withdrawals": annual_withdrawals,
-            "capacity_score": capacity_score, "target_wealth": target_wealth,
-            "current_portfolio": current_portfolio, "horizon_years": horizon_years,
-            "inflation": inflation, "expected_return": expected_return,
-            "avg_drawdown": avg_drawdown, "drawdown_tolerance": drawdown_tolerance,
-            "requirement_score": requirement_score
-        }])
-        csv = df_out.to_csv(index=False)
-        st.download_button("Download inputs and result (CSV):", csv, file_name="risk_capacity_result.csv", mime="text/csv")
+        # The CSV text is cached, so it is only rebuilt when an input or score changes
+        inputs_tuple = (
+            age, dependents, annual_income, annual_fixed, annual_variable,
+            industry, expected_growth, investable_assets, annual_withdrawals,
+            target_wealth, current_portfolio, horizon_years,
+            inflation, expected_return, avg_drawdown, drawdown_tolerance,
+        )
+        csv_text = build_results_csv(inputs_tuple, capacity10, requirement10)
+        st.download_button("Download inputs and result (CSV):", csv_text, file_name="risk_capacity_result.csv", mime="text/csv")
 
         with st.expander("Legal disclaimer:"):
-            st.write("This tool provides educational information only and is not financial or investment advice. Consult a licensed financial professional before acting on outputs. We accept no liability for investment decisions made based on this tool.")
+            st.markdown(DISCLAIMER_MD)
 
-        st.markdown("---")
-        st.write("Purpose: Produce an objective, explainable estimate of a client's financial risk capacity and the minimum risk required to reach their stated goals. Use with behavioral preference and professional judgment.")
+        # Divider and purpose statement (one markdown element)
+        st.markdown(FOOTER_MD)
     else:
-        st.info("Press Calculate to compute scores. If you want instant updates while editing, enable 'Auto-update' above.")
+        st.info(CALCULATE_HINT)
+
+    # Score many clients at once from an uploaded CSV (independent of the form above)
+    batch_panel()
 
 # This is the standard Python idiom for running the main application
 # It ensures the main() function only runs if this file is run directly